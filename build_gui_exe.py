@@ -144,7 +144,7 @@ def create_exe():
         
         if result.returncode == 0:
             print("✅ EXE created successfully using spec file!")
-            print(f"📂 Output location: {os.path.abspath('dist/ZebraPrinterGUI.exe')}")
+            print("📂 Output location:", os.path.abspath('dist/ZebraPrinterGUI.exe'))
             return True
         else:
             print("❌ Spec file build failed, trying direct command...")
@@ -187,7 +187,7 @@ def create_exe():
             
             if result.returncode == 0:
                 print("✅ EXE created successfully!")
-                print(f"📂 Output location: {os.path.abspath('dist/ZebraPrinterGUI.exe')}")
+                print("📂 Output location:", os.path.abspath('dist/ZebraPrinterGUI.exe'))
                 return True
             else:
                 print("❌ Build failed!")
@@ -196,7 +196,7 @@ def create_exe():
                 return False
                 
     except Exception as e:
-        print(f"❌ Build error: {e}")
+        print("❌ Build error:", e)
         return False
 
 def copy_dependencies():
@@ -241,7 +241,7 @@ def test_dependencies():
     
     if missing_modules:
         print(f"\n⚠️  Missing modules: {', '.join(missing_modules)}")
-        print("Please install them using: pip install " + " ".join(missing_modules))
+        print(f"Please install them using: pip install {' '.join(missing_modules)}")
         return False
     
     print("✅ All dependencies available!")
@@ -272,7 +272,7 @@ def main():
         copy_dependencies()
         
         print("\n🎉 Build completed successfully!")
-        print(f"📂 Your executable is ready: {os.path.abspath('dist/ZebraPrinterGUI.exe')}")
+        print("📂 Your executable is ready:", os.path.abspath('dist/ZebraPrinterGUI.exe'))
         print("\n📋 To distribute:")
         print("1. Copy the entire 'dist' folder to the target computer")
         print("2. Run ZebraPrinterGUI.exe")
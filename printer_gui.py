@@ -27,16 +27,80 @@ from datetime import datetime
 import os
 import sys
 import csv
+import io
+import math
+import re
+import shutil
+import subprocess
+import traceback
 import pandas as pd
-import qrcode
 from reportlab.lib.units import cm, mm
-from reportlab.pdfgen import canvas
 from reportlab.lib.colors import black
 
 # Import our modules
-from serial_auto_printer import DeviceAutoPrinter, SerialPortMonitor, DeviceDataParser, ZPLTemplate
+from serial_auto_printer import (DeviceAutoPrinter, SerialPortMonitor, DeviceDataParser, ZPLTemplate,
+                                 read_next_stc, DEFAULT_ZPL_TEMPLATE)
 from zebra_zpl import ZebraZPL
 
+# Help > About dialog text
+ABOUT_TEXT = """Zebra & XPrinter Auto-Printer GUI
+        
+Version: 2.1
+Date: December 2024
+
+Features:
+- Multi-printer support (Zebra GC420T & XPrinter)
+- Simultaneous dual printing (Label + PCB)
+- Dual-mode operation (Auto-Print / Queue)
+- Real-time serial monitoring  
+- CSV data logging and viewing
+- ZPL template management
+- Comprehensive statistics
+
+For support and updates, check the project documentation."""
+
+# Main device log CSV columns
+CSV_HEADERS = (
+    'timestamp', 'stc', 'serial_number', 'imei', 'imsi', 'ccid', 'mac_address',
+    'print_status', 'parse_status', 'raw_data', 'zpl_filename', 'notes'
+)
+
+# Printer name fragments used to auto-select the label and PCB printers
+LABEL_PRINTER_KEYWORDS = ('zebra', 'gc420', 'zdesigner', 'xprinter', 'xp-470', 'xp58', 'xp80', 'xp365', 'pcb', 'thermal')
+PCB_PRINTER_KEYWORDS = ('pcb', 'controller', 'xprinter', 'thermal')
+
+# Combobox choices
+BAUD_RATES = ("9600", "19200", "38400", "57600", "115200")
+CSV_SHOW_OPTIONS = ("Latest 50", "Latest 100", "All Records", "Errors Only", "Valid Only")
+DEVICE_STATUS_VALUES = ('Available', 'Used', 'Reserved', 'Defective')
+
+# Delay before re-filtering while the user is still typing in a search box
+SEARCH_DEBOUNCE_MS = 250
+
+# Koli window table columns, in device log CSV header names; the first
+# KOLI_SEARCH_COLUMNS of them are searched by the filter box
+KOLI_COLUMNS = ('timestamp', 'serial_number', 'imei', 'imsi', 'ccid', 'mac_address',
+                'stc', 'print_status', 'zpl_file', 'raw_data')
+KOLI_SEARCH_COLUMNS = 8
+
+# Box label layout (10x15cm). Every position is fixed, so compute it once.
+BOX_LABEL_WIDTH = 10 * cm
+BOX_LABEL_HEIGHT = 15 * cm
+BOX_LABEL_QR_SIZE = 40 * mm
+BOX_LABEL_QR_X = (BOX_LABEL_WIDTH - BOX_LABEL_QR_SIZE) / 2
+BOX_LABEL_QR_Y = BOX_LABEL_HEIGHT - 10 * mm - BOX_LABEL_QR_SIZE
+BOX_LABEL_TITLE_Y = BOX_LABEL_QR_Y - 6 * mm
+BOX_LABEL_DATE_Y = BOX_LABEL_TITLE_Y - 6 * mm
+BOX_LABEL_LIST_Y = BOX_LABEL_DATE_Y - 9 * mm
+BOX_LABEL_COLUMNS_Y = BOX_LABEL_LIST_Y - 5 * mm
+BOX_LABEL_ROWS_Y = BOX_LABEL_COLUMNS_Y - 4 * mm
+BOX_LABEL_COLUMN_X = (3 * mm, 12 * mm, 42 * mm, 70 * mm)  # STC, Serial, IMEI, MAC
+BOX_LABEL_LINE_HEIGHT = 3 * mm
+BOX_LABEL_BOTTOM = 5 * mm
+# Rows that fit above the bottom margin; the rest only go into the QR code
+BOX_LABEL_MAX_ROWS = math.ceil((BOX_LABEL_ROWS_Y - BOX_LABEL_BOTTOM) / BOX_LABEL_LINE_HEIGHT)
+BOX_DEVICE_KEYS = ('STC', 'SERIAL_NUMBER', 'IMEI', 'IMSI', 'CCID', 'MAC_ADDRESS')
+
 
 class AutoPrinterGUI:
     """Main GUI application for the auto-printer system."""
@@ -53,10 +117,27 @@ class AutoPrinterGUI:
         # System components
         self.auto_printer = None
         self.printer = ZebraZPL()
+        self._printer_instances = {}  # printer name -> ZebraZPL, see _get_printer()
         self.is_monitoring = False
         
-        # GUI update queue
+        # GUI update queue; 'log' messages are batched in process_gui_queue itself
         self.gui_queue = queue.Queue()
+        self._gui_queue_handlers = {
+            'data': self._show_received_data,
+            'stats': self._show_stats,
+            'stc': lambda stc: self.stc_label.config(text=str(stc)),
+            'queue_update': lambda _: self._refresh_queue_views(),
+            'device_processed': lambda data: self._on_device_processed(*data),
+            'add_to_table': lambda data: self.add_device_to_data_table(*data),
+            'add_pcb_to_table': lambda data: self.add_pcb_to_table(*data),
+            'batch_print_done': lambda data: self.on_batch_print_done(*data),
+            'box_label_done': lambda data: self.on_box_label_done(*data),
+            'print_done': lambda data: self.on_print_done(*data),
+            'queue_print_done': lambda data: self.on_queue_print_done(*data),
+        }
+        
+        # Pending root.after ids of debounced callbacks, keyed by name
+        self._pending_after = {}
         
         # Latest received data storage
         self.latest_device_data = {
@@ -68,41 +149,17 @@ class AutoPrinterGUI:
             'MAC_ADDRESS': ''
         }
         
-        # Default template
-        self.current_template = """^XA
-^PW399
-^LL240
-^CI28
-^MD15
-~SD15
-
-^FO20,50^BQN,2,4
-^FDLA,STC:{STC};SN:ATS{SERIAL_NUMBER};IMEI:{IMEI};IMSI:{IMSI};CCID:{CCID};MAC:{MAC_ADDRESS}^FS
-
-^CF0,18,18
-^FO185,32.5^FDSTC:^FS
-^FO185,70^FDS/N:^FS
-^FO185,107.5^FDIMEI:^FS
-^FO185,145^FDIMSI:^FS
-^FO185,182.5^FDCCID:^FS
-^FO185,220^FDMAC:^FS
-
-^CF0,22,16
-^FO225,32.5^FD{STC}^FS
-^FO225,70^FD{SERIAL_NUMBER}^FS
-^FO225,107.5^FD{IMEI}^FS
-^FO225,145^FD{IMSI}^FS
-^FO225,182.5^FD{CCID}^FS
-^FO225,220^FD{MAC_ADDRESS}^FS
-
-^XZ"""
+        # Default template (shared with the command-line auto-printer)
+        self.current_template = DEFAULT_ZPL_TEMPLATE.rstrip("\n")
         
         # Initialize basic CSV path first
         self.csv_file_path = os.path.join('save', 'csv', 'device_log.csv')
         
         self.setup_gui()
-        self.update_printer_list()
-        self.update_pcb_printer_list()
+        # One printer enumeration fills both dropdowns
+        printers = self.printer.refresh_printers()
+        self.update_printer_list(printers=printers)
+        self.update_pcb_printer_list(printers=printers)
         self.update_port_list()
         
         # Initialize STC counter from CSV
@@ -116,8 +173,6 @@ class AutoPrinterGUI:
     
     def initialize_folder_structure(self):
         """Initialize clean, safe folder structure for all saves."""
-        import shutil
-        
         # Define the main save folder structure
         self.save_folders = {
             'main': 'save',
@@ -135,9 +190,9 @@ class AutoPrinterGUI:
                 print("🧹 Cleaned old save folder structure")
             
             # Create clean folder structure
-            for folder_name, folder_path in self.save_folders.items():
+            for folder_path in self.save_folders.values():
                 os.makedirs(folder_path, exist_ok=True)
-                print(f"📁 Created folder: {folder_path}")
+            print("\n".join(f"📁 Created folder: {folder_path}" for folder_path in self.save_folders.values()))
             
             # Initialize main CSV file with headers
             self.csv_file_path = os.path.join(self.save_folders['csv'], 'device_log.csv')
@@ -146,7 +201,7 @@ class AutoPrinterGUI:
             print("✅ Clean folder structure initialized successfully")
             
         except Exception as e:
-            print(f"❌ Error initializing folder structure: {e}")
+            print("❌ Error initializing folder structure:", e)
             # Create minimal structure if error
             os.makedirs('save/csv', exist_ok=True)
             os.makedirs('save/zpl_outputs', exist_ok=True)
@@ -154,37 +209,30 @@ class AutoPrinterGUI:
     
     def initialize_main_csv(self):
         """Initialize the main CSV file with proper headers."""
-        csv_headers = [
-            'timestamp', 'stc', 'serial_number', 'imei', 'imsi', 'ccid', 'mac_address',
-            'print_status', 'parse_status', 'raw_data', 'zpl_filename', 'notes'
-        ]
-        
         # Create CSV with headers if it doesn't exist
         if not os.path.exists(self.csv_file_path):
             try:
                 with open(self.csv_file_path, 'w', newline='', encoding='utf-8') as csvfile:
                     writer = csv.writer(csvfile)
-                    writer.writerow(csv_headers)
-                print(f"📄 Initialized main CSV: {self.csv_file_path}")
+                    writer.writerow(CSV_HEADERS)
+                print("📄 Initialized main CSV:", self.csv_file_path)
             except Exception as e:
-                print(f"❌ Error creating main CSV: {e}")
+                print("❌ Error creating main CSV:", e)
         else:
             # Check if existing CSV has proper format and fix if needed
             try:
                 with open(self.csv_file_path, 'r', encoding='utf-8') as csvfile:
                     first_line = csvfile.readline().strip()
-                    expected_header = ','.join(csv_headers)
+                    expected_header = ','.join(CSV_HEADERS)
                     
                     # If headers don't match, backup and recreate
                     if first_line != expected_header:
                         # Create backup
                         backup_path = self.csv_file_path.replace('.csv', f'_backup_header_fix_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv')
-                        import shutil
                         shutil.copy2(self.csv_file_path, backup_path)
-                        print(f"🔧 Fixed CSV headers - backup saved: {backup_path}")
+                        print("🔧 Fixed CSV headers - backup saved:", backup_path)
                         
                         # Read existing data and rewrite with correct headers
-                        import pandas as pd
                         try:
                             # Try to read with current headers
                             df = pd.read_csv(self.csv_file_path)
@@ -214,12 +262,12 @@ class AutoPrinterGUI:
                             df = df.rename(columns=column_mapping)
                             
                             # Add missing columns
-                            for header in csv_headers:
+                            for header in CSV_HEADERS:
                                 if header not in df.columns:
                                     df[header] = ''
                             
                             # Reorder columns
-                            df = df[csv_headers]
+                            df = df[list(CSV_HEADERS)]
                             
                             # Write corrected CSV
                             df.to_csv(self.csv_file_path, index=False)
@@ -229,14 +277,17 @@ class AutoPrinterGUI:
                             # If pandas fails, just recreate with headers
                             with open(self.csv_file_path, 'w', newline='', encoding='utf-8') as csvfile:
                                 writer = csv.writer(csvfile)
-                                writer.writerow(csv_headers)
+                                writer.writerow(CSV_HEADERS)
                             print(f"⚠️ Recreated CSV with clean headers (data reading failed: {e})")
                         
             except Exception as e:
-                print(f"❌ Error checking CSV format: {e}")
+                print("❌ Error checking CSV format:", e)
     
     def setup_gui(self):
         """Setup the GUI layout."""
+        # Key validation for numeric-only entries (STC, copies)
+        self.digits_vcmd = (self.root.register(self._is_digits), "%P")
+        
         # Create menu bar
         self.setup_menu()
         
@@ -301,13 +352,18 @@ class AutoPrinterGUI:
         ttk.Label(conn_frame, text="Label Printer:").grid(row=0, column=0, sticky="w", padx=5, pady=2)
         self.printer_combo = ttk.Combobox(conn_frame, width=40)
         self.printer_combo.grid(row=0, column=1, padx=5, pady=2)
-        ttk.Button(conn_frame, text="Refresh", command=self.update_printer_list).grid(row=0, column=2, padx=5, pady=2)
+        printer_refresh_button = ttk.Button(conn_frame, text="Refresh", command=self.update_printer_list)
+        printer_refresh_button.grid(row=0, column=2, padx=5, pady=2)
+        # Shift-click bypasses the printer cache
+        printer_refresh_button.bind("<Shift-Button-1>", lambda e: self.update_printer_list(force=True) or "break")
         
         # PCB Printer selection
         ttk.Label(conn_frame, text="PCB Printer:").grid(row=1, column=0, sticky="w", padx=5, pady=2)
         self.pcb_printer_combo = ttk.Combobox(conn_frame, width=40)
         self.pcb_printer_combo.grid(row=1, column=1, padx=5, pady=2)
-        ttk.Button(conn_frame, text="Refresh", command=self.update_pcb_printer_list).grid(row=1, column=2, padx=5, pady=2)
+        pcb_refresh_button = ttk.Button(conn_frame, text="Refresh", command=self.update_pcb_printer_list)
+        pcb_refresh_button.grid(row=1, column=2, padx=5, pady=2)
+        pcb_refresh_button.bind("<Shift-Button-1>", lambda e: self.update_pcb_printer_list(force=True) or "break")
         
         # PCB Enable checkbox
         self.pcb_enabled_var = tk.BooleanVar(value=True)
@@ -322,7 +378,7 @@ class AutoPrinterGUI:
         
         # Baud rate
         ttk.Label(conn_frame, text="Baud Rate:").grid(row=4, column=0, sticky="w", padx=5, pady=2)
-        self.baud_combo = ttk.Combobox(conn_frame, values=["9600", "19200", "38400", "57600", "115200"], width=20)
+        self.baud_combo = ttk.Combobox(conn_frame, values=BAUD_RATES, width=20)
         self.baud_combo.set("115200")  # Default to 115200
         self.baud_combo.grid(row=4, column=1, sticky="w", padx=5, pady=2)
         
@@ -335,7 +391,7 @@ class AutoPrinterGUI:
         self.stc_label.grid(row=0, column=1, sticky="w", padx=5, pady=2)
         
         ttk.Label(stc_frame, text="Set STC:").grid(row=0, column=2, sticky="w", padx=5, pady=2)
-        self.stc_entry = ttk.Entry(stc_frame, width=10)
+        self.stc_entry = ttk.Entry(stc_frame, width=10, validate="key", validatecommand=self.digits_vcmd)
         self.stc_entry.insert(0, "60000")
         self.stc_entry.grid(row=0, column=3, sticky="w", padx=5, pady=2)
         
@@ -594,7 +650,7 @@ class AutoPrinterGUI:
             # Debug logging to see what data is being displayed
             self.log_message(f"Updated latest data display: SN={device_data.get('SERIAL_NUMBER', '---')}, IMEI={device_data.get('IMEI', '---')}", "DEBUG")
         except Exception as e:
-            print(f"Error updating latest data display: {e}")
+            print("Error updating latest data display:", e)
             self.log_message(f"Error updating latest data display: {e}", "ERROR")
 
     def clear_latest_data_display(self):
@@ -611,6 +667,14 @@ class AutoPrinterGUI:
         except Exception as e:
             self.log_message(f"Error clearing latest data display: {e}", "ERROR")
 
+    def copy_to_clipboard(self, text):
+        """Replace the clipboard contents with text."""
+        self.root.clipboard_clear()
+        self.root.clipboard_append(text)
+        # Flush pending idle work only; a full update() would also dispatch queued
+        # input events and timers from inside this handler
+        self.root.update_idletasks()
+    
     def copy_serial_data(self):
         """Copy all serial data preview to clipboard."""
         try:
@@ -618,9 +682,7 @@ class AutoPrinterGUI:
             serial_data = self.data_text.get("1.0", "end-1c")
             if serial_data.strip():
                 # Copy to clipboard
-                self.root.clipboard_clear()
-                self.root.clipboard_append(serial_data)
-                self.root.update()  # Ensure clipboard is updated
+                self.copy_to_clipboard(serial_data)
                 self.log_message(f"Copied {len(serial_data)} characters to clipboard", "INFO")
                 messagebox.showinfo("Success", f"Serial data copied to clipboard!\n{len(serial_data)} characters copied")
             else:
@@ -640,21 +702,24 @@ class AutoPrinterGUI:
     def copy_latest_data(self):
         """Copy the latest received data to clipboard."""
         try:
-            latest_data_text = "Latest Received Device Data:\n"
-            latest_data_text += "=" * 40 + "\n"
-            latest_data_text += f"STC: {self.latest_data_labels['stc_value'].cget('text')}\n"
-            latest_data_text += f"Serial Number: {self.latest_data_labels['sn_value'].cget('text')}\n"
-            latest_data_text += f"IMEI: {self.latest_data_labels['imei_value'].cget('text')}\n"
-            latest_data_text += f"IMSI: {self.latest_data_labels['imsi_value'].cget('text')}\n"
-            latest_data_text += f"CCID: {self.latest_data_labels['ccid_value'].cget('text')}\n"
-            latest_data_text += f"MAC Address: {self.latest_data_labels['mac_value'].cget('text')}\n"
-            latest_data_text += "=" * 40 + "\n"
+            labels = self.latest_data_labels
+            separator = "=" * 40
+            latest_data_text = "\n".join([
+                "Latest Received Device Data:",
+                separator,
+                f"STC: {labels['stc_value'].cget('text')}",
+                f"Serial Number: {labels['sn_value'].cget('text')}",
+                f"IMEI: {labels['imei_value'].cget('text')}",
+                f"IMSI: {labels['imsi_value'].cget('text')}",
+                f"CCID: {labels['ccid_value'].cget('text')}",
+                f"MAC Address: {labels['mac_value'].cget('text')}",
+                separator,
+                "",
+            ])
             
             if latest_data_text.strip():
                 # Copy to clipboard
-                self.root.clipboard_clear()
-                self.root.clipboard_append(latest_data_text)
-                self.root.update()  # Ensure clipboard is updated
+                self.copy_to_clipboard(latest_data_text)
                 self.log_message("Latest data copied to clipboard", "INFO")
                 messagebox.showinfo("Success", "Latest device data copied to clipboard!")
             else:
@@ -669,21 +734,21 @@ class AutoPrinterGUI:
             if hasattr(self, 'auto_printer') and self.auto_printer and hasattr(self.auto_printer, 'parser'):
                 buffer_data = self.auto_printer.parser.get_buffered_data()
                 
-                buffer_text = "Packet Buffer Contents:\n"
-                buffer_text += "=" * 40 + "\n"
+                separator = "=" * 40
+                lines = ["Packet Buffer Contents:", separator]
                 if buffer_data:
-                    buffer_text += f"Buffered Data: {repr(buffer_data)}\n"
-                    buffer_text += f"Buffer Length: {len(buffer_data)} characters\n"
-                    buffer_text += f"Contains ##: {'##' in buffer_data}\n"
-                    buffer_text += f"Contains |: {'|' in buffer_data}\n"
+                    lines.append(f"Buffered Data: {repr(buffer_data)}")
+                    lines.append(f"Buffer Length: {len(buffer_data)} characters")
+                    lines.append(f"Contains ##: {'##' in buffer_data}")
+                    lines.append(f"Contains |: {'|' in buffer_data}")
                 else:
-                    buffer_text += "Buffer is empty\n"
-                buffer_text += "=" * 40 + "\n"
+                    lines.append("Buffer is empty")
+                lines.append(separator)
+                lines.append("")
+                buffer_text = "\n".join(lines)
                 
                 # Copy to clipboard
-                self.root.clipboard_clear()
-                self.root.clipboard_append(buffer_text)
-                self.root.update()  # Ensure clipboard is updated
+                self.copy_to_clipboard(buffer_text)
                 self.log_message("Packet buffer copied to clipboard", "INFO")
                 
                 if buffer_data:
@@ -731,9 +796,7 @@ class AutoPrinterGUI:
             filled_template = template.format(**template_data)
             
             # Copy to clipboard
-            self.root.clipboard_clear()
-            self.root.clipboard_append(filled_template)
-            self.root.update()
+            self.copy_to_clipboard(filled_template)
             
             self.log_message("ZPL label template copied to clipboard", "INFO")
             messagebox.showinfo("Success", 
@@ -822,9 +885,7 @@ class AutoPrinterGUI:
                     filled_template = template.format(**template_data)
                     
                     # Copy to clipboard
-                    self.root.clipboard_clear()
-                    self.root.clipboard_append(filled_template)
-                    self.root.update()
+                    self.copy_to_clipboard(filled_template)
                     
                     result['cancelled'] = False
                     result['data'] = template_data
@@ -873,9 +934,11 @@ class AutoPrinterGUI:
         
         # Initialize box label variables
         self.box_devices_df = None
+        self._box_search_index = None  # lowercased row text for the filter; reset when box_devices_df changes
         self.box_current_page = 0
         self.box_devices_per_page = 20
         self.box_selected_devices = []
+        self.box_rendered_rows = []  # (values, tags) currently shown in box_tree
         
         # Top controls frame - File operations
         file_control_frame = ttk.LabelFrame(box_frame, text="CSV Data Source")
@@ -911,7 +974,7 @@ class AutoPrinterGUI:
         filter_entry = ttk.Entry(edit_control_frame, textvariable=self.box_filter_var, width=20)
         filter_entry.pack(side=tk.LEFT, padx=5)
         # Bind filter to update display as user types
-        self.box_filter_var.trace('w', lambda *args: self.filter_box_data())
+        self.box_filter_var.trace('w', lambda *args: self.debounce('box_filter', self.filter_box_data))
         
         # Navigation and selection controls
         nav_control_frame = ttk.LabelFrame(box_frame, text="Navigation & Selection")
@@ -940,7 +1003,8 @@ class AutoPrinterGUI:
         self.box_number_var = tk.StringVar(value="BOX001")
         ttk.Entry(box_create_frame, textvariable=self.box_number_var, width=15).pack(side=tk.LEFT, padx=5)
         
-        ttk.Button(box_create_frame, text="Create PDF Label", command=self.create_box_pdf_label).pack(side=tk.LEFT, padx=20)
+        self.box_create_button = ttk.Button(box_create_frame, text="Create PDF Label", command=self.create_box_pdf_label)
+        self.box_create_button.pack(side=tk.LEFT, padx=20)
         ttk.Button(box_create_frame, text="📁 Open Box Labels", command=self.open_box_labels_folder).pack(side=tk.LEFT, padx=5)
         
         # Device list frame with enhanced table
@@ -1069,7 +1133,7 @@ class AutoPrinterGUI:
         ttk.Label(csv_nav_frame, text="Show:").pack(side=tk.LEFT)
         self.csv_show_var = tk.StringVar(value="Latest 50")
         csv_show_combo = ttk.Combobox(csv_nav_frame, textvariable=self.csv_show_var, 
-                                     values=["Latest 50", "Latest 100", "All Records", "Errors Only", "Valid Only"], 
+                                     values=CSV_SHOW_OPTIONS, 
                                      width=15, state="readonly")
         csv_show_combo.pack(side=tk.LEFT, padx=(5, 20))
         csv_show_combo.bind("<<ComboboxSelected>>", lambda e: self.refresh_csv_view())
@@ -1079,7 +1143,7 @@ class AutoPrinterGUI:
         self.csv_search_var = tk.StringVar()
         csv_search_entry = ttk.Entry(csv_nav_frame, textvariable=self.csv_search_var, width=20)
         csv_search_entry.pack(side=tk.LEFT, padx=(5, 10))
-        csv_search_entry.bind("<KeyRelease>", lambda e: self.refresh_csv_view())
+        csv_search_entry.bind("<KeyRelease>", lambda e: self.debounce('csv_search', self.refresh_csv_view))
         
         ttk.Button(csv_nav_frame, text="Export Filtered", command=self.export_filtered_csv).pack(side=tk.RIGHT, padx=5)
         
@@ -1206,21 +1270,14 @@ class AutoPrinterGUI:
         
         ttk.Label(print_frame, text="Default copies:").grid(row=1, column=0, sticky="w", padx=5, pady=2)
         self.copies_var = tk.StringVar(value="1")
-        ttk.Entry(print_frame, textvariable=self.copies_var, width=5).grid(row=1, column=1, sticky="w", padx=5, pady=2)
+        ttk.Entry(print_frame, textvariable=self.copies_var, width=5,
+                  validate="key", validatecommand=self.digits_vcmd).grid(row=1, column=1, sticky="w", padx=5, pady=2)
     
     def initialize_stc_from_csv(self):
         """Initialize STC counter value from CSV file."""
         try:
-            # Create a temporary auto-printer instance to check CSV
-            temp_printer = DeviceAutoPrinter(
-                zpl_template=self.current_template,
-                initial_stc=60000,
-                pcb_printer_name=None,  # No PCB printer needed for STC check
-                csv_file_path=self.csv_file_path
-            )
-            
-            # Get the next STC value based on CSV
-            next_stc = temp_printer.current_stc
+            # Get the next STC value based on CSV; no auto-printer or printer lookup needed
+            next_stc = read_next_stc(self.csv_file_path)
             
             # Update GUI
             self.stc_entry.delete(0, "end")
@@ -1236,15 +1293,16 @@ class AutoPrinterGUI:
             self.stc_entry.insert(0, "60000")
             self.stc_label.config(text="60000")
     
-    def update_printer_list(self):
-        """Update the printer dropdown list."""
+    def update_printer_list(self, force=False, printers=None):
+        """Update the printer dropdown list (cached enumeration unless force or printers is given)."""
         try:
-            printers = self.printer.list_printers()
+            if printers is None:
+                printers = self.printer.refresh_printers(force)
             self.printer_combo['values'] = printers
             
             # Auto-select Zebra or XPrinter if found
             for printer in printers:
-                if any(x in printer.lower() for x in ['zebra', 'gc420', 'zdesigner', 'xprinter', 'xp-470', 'xp58', 'xp80', 'xp365', 'pcb', 'thermal']):
+                if any(x in printer.lower() for x in LABEL_PRINTER_KEYWORDS):
                     self.printer_combo.set(printer)
                     break
             else:
@@ -1254,16 +1312,17 @@ class AutoPrinterGUI:
         except Exception as e:
             self.log_message(f"Error updating printer list: {e}", "ERROR")
     
-    def update_pcb_printer_list(self):
-        """Update the PCB printer dropdown list."""
+    def update_pcb_printer_list(self, force=False, printers=None):
+        """Update the PCB printer dropdown list (cached enumeration unless force or printers is given)."""
         try:
-            printers = self.printer.list_printers()
+            if printers is None:
+                printers = self.printer.refresh_printers(force)
             self.pcb_printer_combo['values'] = printers
             
             # Auto-select PCB printer if found (different from main printer)
             main_printer = self.printer_combo.get()
             for printer in printers:
-                if printer != main_printer and any(x in printer.lower() for x in ['pcb', 'controller', 'xprinter', 'thermal']):
+                if printer != main_printer and any(x in printer.lower() for x in PCB_PRINTER_KEYWORDS):
                     self.pcb_printer_combo.set(printer)
                     break
             else:
@@ -1313,10 +1372,11 @@ class AutoPrinterGUI:
                 messagebox.showerror("Error", "Please select a serial port")
                 return
             
-            # Get STC value
-            try:
-                initial_stc = int(self.stc_entry.get())
-            except ValueError:
+            # Get STC value (the entry only accepts digits, so it is a number or empty)
+            stc_text = self.stc_entry.get()
+            if stc_text:
+                initial_stc = int(stc_text)
+            else:
                 initial_stc = 60000
                 self.stc_entry.delete(0, "end")
                 self.stc_entry.insert(0, "60000")
@@ -1331,7 +1391,9 @@ class AutoPrinterGUI:
                 pcb_printer_name=pcb_printer_name,
                 initial_stc=initial_stc,
                 zpl_output_dir=self.save_folders['zpl_outputs'],
-                csv_file_path=self.csv_file_path
+                csv_file_path=self.csv_file_path,
+                printer=self._get_printer(printer_name),
+                pcb_printer=self._get_printer(pcb_printer_name) if pcb_printer_name else None
             )
             
             # Set PCB printing enabled state
@@ -1354,10 +1416,12 @@ class AutoPrinterGUI:
                 
                 # Use streaming data processor to handle potentially incomplete packets
                 complete_packets = self.auto_printer.parser.process_streaming_data(data)
+                # Read the Tk variable once per chunk rather than once per packet
+                auto_print = self.auto_print_mode.get()
                 
                 # Process each complete packet
                 for device_data in complete_packets:
-                    if self.auto_print_mode.get():
+                    if auto_print:
                         # Auto-print mode: process directly (skip queue, print immediately)
                         success, zpl_filename, stc_assigned, pcb_success = self.auto_printer.print_device_label_with_save(device_data, data)
                         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -1439,6 +1503,14 @@ class AutoPrinterGUI:
         except Exception as e:
             self.log_message(f"Error stopping monitoring: {e}", "ERROR")
     
+    def _get_printer(self, printer_name):
+        """Return a cached ZebraZPL instance for printer_name, creating it on first use."""
+        printer = self._printer_instances.get(printer_name)
+        if printer is None:
+            printer = ZebraZPL(printer_name)
+            self._printer_instances[printer_name] = printer
+        return printer
+    
     def test_print(self):
         """Test print a simple label."""
         try:
@@ -1447,15 +1519,10 @@ class AutoPrinterGUI:
                 messagebox.showerror("Error", "Please select a printer")
                 return
             
-            printer = ZebraZPL(printer_name)
-            success = printer.print_text_label("GUI TEST", ["Print test from GUI", f"Time: {datetime.now().strftime('%H:%M:%S')}"])
-            
-            if success:
-                self.log_message("Test print successful", "INFO")
-                messagebox.showinfo("Success", "Test print completed successfully!")
-            else:
-                self.log_message("Test print failed", "ERROR")
-                messagebox.showerror("Error", "Test print failed")
+            printer = self._get_printer(printer_name)
+            zpl = printer.create_text_label("GUI TEST", ["Print test from GUI", f"Time: {datetime.now().strftime('%H:%M:%S')}"])
+            self._report_print(printer.send_zpl_async(zpl),
+                               "Test print completed successfully!", "Test print failed")
                 
         except Exception as e:
             self.log_message(f"Test print error: {e}", "ERROR")
@@ -1514,15 +1581,9 @@ class AutoPrinterGUI:
                 zpl_template = ZPLTemplate(template)
                 zpl_commands = zpl_template.render(device_data)
                 
-                printer = ZebraZPL(printer_name)
-                success = printer.send_zpl(zpl_commands)
-                
-                if success:
-                    self.log_message("Test print successful", "INFO")
-                    messagebox.showinfo("Success", "Test data processed and printed successfully!")
-                else:
-                    self.log_message("Test print failed", "ERROR")
-                    messagebox.showerror("Error", "Print failed")
+                printer = self._get_printer(printer_name)
+                self._report_print(printer.send_zpl_async(zpl_commands),
+                                   "Test data processed and printed successfully!", "Print failed")
             else:
                 messagebox.showinfo("Success", "Test data parsed successfully! (Auto-print disabled)")
                 
@@ -1530,6 +1591,25 @@ class AutoPrinterGUI:
             self.log_message(f"Test processing error: {e}", "ERROR")
             messagebox.showerror("Error", f"Test failed: {e}")
     
+    def _report_print(self, future, success_msg, failure_msg):
+        """Report the result of an async send through gui_queue once it completes."""
+        def done(f):
+            error = f.exception()
+            if error is not None:
+                self.gui_queue.put(('print_done', (False, f"{failure_msg}: {error}")))
+            else:
+                self.gui_queue.put(('print_done', (f.result(), success_msg if f.result() else failure_msg)))
+        future.add_done_callback(done)
+    
+    def on_print_done(self, success, message):
+        """Show the result of an async test print on the Tk thread."""
+        if success:
+            self.log_message("Test print successful", "INFO")
+            messagebox.showinfo("Success", message)
+        else:
+            self.log_message(message, "ERROR")
+            messagebox.showerror("Error", message)
+    
     def test_table_data(self):
         """Test adding data directly to the unified table."""
         try:
@@ -1558,7 +1638,6 @@ class AutoPrinterGUI:
     def test_regex(self):
         """Test the regex pattern."""
         try:
-            import re
             pattern = self.regex_entry.get()
             test_data = self.test_data_entry.get()
             
@@ -1656,9 +1735,7 @@ class AutoPrinterGUI:
             logs = self.log_text.get("1.0", "end-1c")
             if logs.strip():
                 # Copy to clipboard
-                self.root.clipboard_clear()
-                self.root.clipboard_append(logs)
-                self.root.update()  # Ensure clipboard is updated
+                self.copy_to_clipboard(logs)
                 messagebox.showinfo("Success", f"Logs copied to clipboard!\n{len(logs)} characters copied")
             else:
                 messagebox.showwarning("Warning", "No logs to copy")
@@ -1668,7 +1745,6 @@ class AutoPrinterGUI:
     def open_zpl_folder(self):
         """Open the ZPL outputs folder."""
         try:
-            import subprocess
             zpl_folder = os.path.abspath(self.save_folders['zpl_outputs'])
             if os.path.exists(zpl_folder):
                 subprocess.Popen(f'explorer "{zpl_folder}"')
@@ -1682,7 +1758,6 @@ class AutoPrinterGUI:
     def open_csv_file(self):
         """Open the CSV log file."""
         try:
-            import subprocess
             csv_file = os.path.abspath(self.get_csv_path())
             if os.path.exists(csv_file):
                 subprocess.Popen(f'start excel "{csv_file}"', shell=True)
@@ -1694,7 +1769,6 @@ class AutoPrinterGUI:
     def open_box_labels_folder(self):
         """Open the box labels folder."""
         try:
-            import subprocess
             box_labels_folder = os.path.abspath(self.save_folders['box_labels'])
             if os.path.exists(box_labels_folder):
                 subprocess.Popen(f'explorer "{box_labels_folder}"')
@@ -1721,21 +1795,24 @@ class AutoPrinterGUI:
     
     def update_stc(self):
         """Update the STC counter value."""
-        try:
-            new_stc = int(self.stc_entry.get())
-            if new_stc < 0:
-                messagebox.showerror("Error", "STC value must be non-negative")
-                return
-            
-            if self.auto_printer:
-                self.auto_printer.set_stc_value(new_stc)
-                self.stc_label.config(text=str(new_stc))
-                self.log_message(f"STC counter updated to {new_stc}", "INFO")
-            else:
-                messagebox.showwarning("Warning", "Auto-printer not started. STC will be set when monitoring starts.")
-                
-        except ValueError:
+        # The entry only accepts digits, so an empty field is the only invalid value
+        stc_text = self.stc_entry.get()
+        if not stc_text:
             messagebox.showerror("Error", "Please enter a valid number for STC")
+            return
+        
+        new_stc = int(stc_text)
+        if self.auto_printer:
+            self.auto_printer.set_stc_value(new_stc)
+            self.stc_label.config(text=str(new_stc))
+            self.log_message(f"STC counter updated to {new_stc}", "INFO")
+        else:
+            messagebox.showwarning("Warning", "Auto-printer not started. STC will be set when monitoring starts.")
+    
+    @staticmethod
+    def _is_digits(proposed):
+        """Tk validatecommand: allow only an empty string or decimal digits."""
+        return proposed == "" or proposed.isdecimal()
     
     def print_selected_device(self):
         """Print the selected device from the queue."""
@@ -1761,27 +1838,52 @@ class AutoPrinterGUI:
             if result:
                 final_stc, should_print = result
                 if should_print and self.auto_printer:
-                    # Find device in queue and print it
-                    for i, device_entry in enumerate(self.auto_printer.pending_devices):
+                    # Find device in queue and print it off the Tk thread; the result
+                    # comes back through gui_queue
+                    for device_entry in self.auto_printer.pending_devices:
                         if device_entry['device_data'].get('SERIAL_NUMBER') == serial:
+                            # A device already being sent is not printed a second time
+                            if device_entry['status'] == 'PRINTING':
+                                messagebox.showwarning("Warning", f"Device {serial} is already printing")
+                                break
+                            
                             # Update STC if changed
                             if final_stc != stc:
                                 device_entry['stc_assigned'] = final_stc
                             
-                            success, zpl_filename = self.auto_printer.print_device_from_queue(i, final_stc)
-                            if success:
-                                self.log_message(f"Printed device {serial} with STC {final_stc}", "INFO")
-                                # Remove from GUI queue
-                                self.queue_tree.delete(selection[0])
-                                self.update_queue_display()
-                            else:
-                                self.log_message(f"Failed to print device {serial}", "ERROR")
+                            device_entry['status'] = 'PRINTING'
+                            worker = threading.Thread(target=self._print_queue_entry_worker,
+                                                      args=(self.auto_printer, device_entry, final_stc,
+                                                            serial, selection[0]),
+                                                      daemon=True)
+                            worker.start()
                             break
                     
         except Exception as e:
             self.log_message(f"Error printing selected device: {e}", "ERROR")
             messagebox.showerror("Error", f"Failed to print device: {e}")
     
+    def _print_queue_entry_worker(self, auto_printer, device_entry, stc, serial, item_id):
+        """Print one queued device in a background thread (no Tk calls here)."""
+        try:
+            success = auto_printer.print_queue_entry(device_entry, stc)
+        except Exception as e:
+            self.log_message(f"Error printing queued device {serial}: {e}", "ERROR")
+            device_entry['status'] = 'FAILED'
+            success = False
+        self.gui_queue.put(('queue_print_done', (success, serial, stc, item_id)))
+    
+    def on_queue_print_done(self, success, serial, stc, item_id):
+        """Finish printing a selected queue device on the Tk thread."""
+        if success:
+            self.log_message(f"Printed device {serial} with STC {stc}", "INFO")
+            # Remove from GUI queue, unless the view was rebuilt meanwhile
+            if self.queue_tree.exists(item_id):
+                self.queue_tree.delete(item_id)
+            self.update_queue_display()
+        else:
+            self.log_message(f"Failed to print device {serial}", "ERROR")
+    
     def print_all_devices(self):
         """Print all devices in the queue."""
         try:
@@ -1793,33 +1895,60 @@ class AutoPrinterGUI:
                 f"Print all {len(self.auto_printer.pending_devices)} devices in queue?")
             
             if result:
-                printed_count = 0
-                failed_count = 0
-                
-                # Print all devices (process in reverse order to maintain indices)
-                for i in range(len(self.auto_printer.pending_devices) - 1, -1, -1):
-                    device_entry = self.auto_printer.pending_devices[i]
-                    stc = device_entry['stc_assigned']
-                    success, zpl_filename = self.auto_printer.print_device_from_queue(i, stc)
-                    
-                    if success:
-                        printed_count += 1
-                    else:
-                        failed_count += 1
-                
-                # Clear GUI queue
-                for item in self.queue_tree.get_children():
-                    self.queue_tree.delete(item)
-                
-                self.update_queue_display()
-                self.log_message(f"Batch print completed: {printed_count} success, {failed_count} failed", "INFO")
-                messagebox.showinfo("Complete", 
-                    f"Batch print completed:\n{printed_count} printed successfully\n{failed_count} failed")
+                # Send from a worker thread so printer I/O never blocks Tk; the summary
+                # comes back through gui_queue. The worker gets its own printer reference
+                # and entry list (reverse order as before), since stop_monitoring can
+                # clear self.auto_printer mid-batch. Devices already being printed
+                # from Print Selected are left out so they are not printed twice.
+                entries = [entry for entry in self.auto_printer.pending_devices[::-1]
+                           if entry['status'] != 'PRINTING']
+                if not entries:
+                    messagebox.showinfo("Info", "All queued devices are already printing")
+                    return
+                for entry in entries:
+                    entry['status'] = 'PRINTING'
+                self.print_all_btn.config(state='disabled')
+                worker = threading.Thread(target=self._print_all_worker,
+                                          args=(self.auto_printer, entries), daemon=True)
+                worker.start()
                 
         except Exception as e:
             self.log_message(f"Error printing all devices: {e}", "ERROR")
             messagebox.showerror("Error", f"Failed to print all devices: {e}")
     
+    def _print_all_worker(self, auto_printer, entries):
+        """Print queued devices in a background thread (no Tk calls here)."""
+        printed_count = 0
+        failed_count = 0
+        
+        for device_entry in entries:
+            try:
+                success = auto_printer.print_queue_entry(device_entry, device_entry['stc_assigned'])
+            except Exception as e:
+                serial = device_entry.get('device_data', {}).get('SERIAL_NUMBER', 'UNKNOWN')
+                self.log_message(f"Error printing queued device {serial}: {e}", "ERROR")
+                device_entry['status'] = 'FAILED'
+                success = False
+            
+            if success:
+                printed_count += 1
+            else:
+                failed_count += 1
+        
+        self.gui_queue.put(('batch_print_done', (printed_count, failed_count)))
+    
+    def on_batch_print_done(self, printed_count, failed_count):
+        """Finish a Print All batch on the Tk thread."""
+        self.print_all_btn.config(state='normal')
+        
+        # Clear GUI queue
+        self.queue_tree.delete(*self.queue_tree.get_children())
+        
+        self.update_queue_display()
+        self.log_message(f"Batch print completed: {printed_count} success, {failed_count} failed", "INFO")
+        messagebox.showinfo("Complete", 
+            f"Batch print completed:\n{printed_count} printed successfully\n{failed_count} failed")
+    
     def remove_selected_device(self):
         """Remove the selected device from the queue."""
         try:
@@ -1862,8 +1991,7 @@ class AutoPrinterGUI:
             
             if result:
                 self.auto_printer.pending_devices.clear()
-                for item in self.queue_tree.get_children():
-                    self.queue_tree.delete(item)
+                self.queue_tree.delete(*self.queue_tree.get_children())
                 self.update_queue_display()
                 self.log_message(f"Cleared {count} devices from queue", "INFO")
                 
@@ -1898,7 +2026,7 @@ class AutoPrinterGUI:
         stc_frame.pack(fill="x", padx=10, pady=5)
         
         ttk.Label(stc_frame, text="STC Value:").grid(row=0, column=0, sticky="w", padx=5, pady=5)
-        stc_entry = ttk.Entry(stc_frame, width=10)
+        stc_entry = ttk.Entry(stc_frame, width=10, validate="key", validatecommand=self.digits_vcmd)
         stc_entry.insert(0, str(device_data[0]))
         stc_entry.grid(row=0, column=1, sticky="w", padx=5, pady=5)
         
@@ -1907,12 +2035,13 @@ class AutoPrinterGUI:
         button_frame.pack(fill="x", padx=10, pady=10)
         
         def on_print():
-            try:
-                result['stc'] = int(stc_entry.get())
-                result['print'] = True
-                dialog.destroy()
-            except ValueError:
+            stc_text = stc_entry.get()
+            if not stc_text:
                 messagebox.showerror("Error", "Please enter a valid STC number")
+                return
+            result['stc'] = int(stc_text)
+            result['print'] = True
+            dialog.destroy()
         
         def on_cancel():
             result['print'] = False
@@ -1932,8 +2061,7 @@ class AutoPrinterGUI:
         """Update the device data table display based on current mode."""
         try:
             # Clear existing items
-            for item in self.data_tree.get_children():
-                self.data_tree.delete(item)
+            self.data_tree.delete(*self.data_tree.get_children())
             
             if not self.auto_printer:
                 return
@@ -2016,8 +2144,7 @@ class AutoPrinterGUI:
             # Keep only last 100 entries to prevent memory issues
             children = self.data_tree.get_children()
             if len(children) > 100:
-                for child in children[100:]:
-                    self.data_tree.delete(child)
+                self.data_tree.delete(*children[100:])
                     
         except Exception as e:
             self.log_message(f"Error adding device to data table: {e}", "ERROR")
@@ -2025,8 +2152,7 @@ class AutoPrinterGUI:
     def clear_data_table(self):
         """Clear all entries from the data table."""
         try:
-            for item in self.data_tree.get_children():
-                self.data_tree.delete(item)
+            self.data_tree.delete(*self.data_tree.get_children())
             self.log_message("Data table cleared", "INFO")
         except Exception as e:
             self.log_message(f"Error clearing data table: {e}", "ERROR")
@@ -2048,71 +2174,77 @@ class AutoPrinterGUI:
         
         self.gui_queue.put(('log', log_entry))
     
+    def debounce(self, key, callback, delay=SEARCH_DEBOUNCE_MS):
+        """Run callback once after delay ms, restarting the wait on every call with the same key."""
+        pending = self._pending_after.pop(key, None)
+        if pending is not None:
+            self.root.after_cancel(pending)
+        
+        def run():
+            self._pending_after.pop(key, None)
+            callback()
+        
+        self._pending_after[key] = self.root.after(delay, run)
+    
     def process_gui_queue(self):
         """Process GUI update queue."""
+        log_entries = []
         try:
             while True:
                 item = self.gui_queue.get_nowait()
                 msg_type, data = item
                 
                 if msg_type == 'log':
-                    self.log_text.insert("end", data)
-                    if self.auto_scroll_var.get():
-                        self.log_text.see("end")
-                
-                elif msg_type == 'data':
-                    # Update data preview
-                    timestamp = datetime.now().strftime("%H:%M:%S")
-                    preview_text = f"[{timestamp}] Received: {data}\n"
-                    self.data_text.insert("end", preview_text)
-                    self.data_text.see("end")
-                    
-                    # Keep only last 50 lines
-                    lines = self.data_text.get("1.0", "end-1c").split('\n')
-                    if len(lines) > 50:
-                        self.data_text.delete("1.0", f"{len(lines)-50}.0")
-                
-                elif msg_type == 'stats':
-                    # Update statistics
-                    stats = data
-                    self.processed_label.config(text=str(stats.get('devices_processed', 0)))
-                    self.success_label.config(text=str(stats.get('successful_prints', 0)))
-                    self.failed_label.config(text=str(stats.get('failed_prints', 0)))
-                    self.errors_label.config(text=str(stats.get('parse_errors', 0)))
-                
-                elif msg_type == 'stc':
-                    # Update STC display
-                    self.stc_label.config(text=str(data))
-                
-                elif msg_type == 'queue_update':
-                    # Update device queue display
-                    self.update_device_queue_display()
-                    self.update_queue_display()
-                
-                elif msg_type == 'device_processed':
-                    # Update latest received data display
-                    device_data, stc = data
-                    self.log_message(f"Processing device_processed message: SN={device_data.get('SERIAL_NUMBER')}, STC={stc}", "DEBUG")
-                    self.update_latest_data_display(device_data, stc)
-                
-                elif msg_type == 'add_to_table':
-                    # Add device to data table
-                    device_data, status, timestamp = data
-                    self.add_device_to_data_table(device_data, status, timestamp)
+                    # Collected and written with a single insert below
+                    log_entries.append(data)
+                    continue
                 
-                elif msg_type == 'add_pcb_to_table':
-                    # Add PCB entry to PCB table
-                    serial_number, status, timestamp, device_stc = data
-                    self.add_pcb_to_table(serial_number, status, timestamp, device_stc)
+                handler = self._gui_queue_handlers.get(msg_type)
+                if handler:
+                    handler(data)
                 
         except queue.Empty:
             pass
         except Exception as e:
-            print(f"GUI queue error: {e}")
+            print("GUI queue error:", e)
+        
+        if log_entries:
+            self.log_text.insert("end", "".join(log_entries))
+            if self.auto_scroll_var.get():
+                self.log_text.see("end")
         
         # Schedule next update
         self.root.after(100, self.process_gui_queue)
     
+    def _show_received_data(self, data):
+        """Append a received serial chunk to the data preview."""
+        timestamp = datetime.now().strftime("%H:%M:%S")
+        self.data_text.insert("end", f"[{timestamp}] Received: {data}\n")
+        self.data_text.see("end")
+        
+        # Keep only last 50 lines; the line count comes from the end index
+        # instead of copying and splitting the whole text
+        line_count = int(self.data_text.index("end-1c").split('.')[0])
+        if line_count > 50:
+            self.data_text.delete("1.0", f"{line_count-50}.0")
+    
+    def _show_stats(self, stats):
+        """Update the statistics labels."""
+        self.processed_label.config(text=str(stats.get('devices_processed', 0)))
+        self.success_label.config(text=str(stats.get('successful_prints', 0)))
+        self.failed_label.config(text=str(stats.get('failed_prints', 0)))
+        self.errors_label.config(text=str(stats.get('parse_errors', 0)))
+    
+    def _refresh_queue_views(self):
+        """Redraw both device queue displays."""
+        self.update_device_queue_display()
+        self.update_queue_display()
+    
+    def _on_device_processed(self, device_data, stc):
+        """Show a processed device in the latest received data panel."""
+        self.log_message(f"Processing device_processed message: SN={device_data.get('SERIAL_NUMBER')}, STC={stc}", "DEBUG")
+        self.update_latest_data_display(device_data, stc)
+    
     def setup_menu(self):
         """Setup the menu bar."""
         menubar = tk.Menu(self.root)
@@ -2163,7 +2295,7 @@ class AutoPrinterGUI:
         
         ttk.Label(search_frame, text="Search:").pack(side="left", padx=(0, 5))
         self.csv_search_var = tk.StringVar()
-        self.csv_search_var.trace('w', self.filter_csv_data)
+        self.csv_search_var.trace('w', lambda *args: self.debounce('koli_search', self.filter_csv_data))
         search_entry = ttk.Entry(search_frame, textvariable=self.csv_search_var, width=30)
         search_entry.pack(side="left", padx=(0, 10))
         
@@ -2223,115 +2355,63 @@ class AutoPrinterGUI:
         # Load initial data
         self.refresh_csv_data()
     
-    def refresh_csv_data(self):
-        """Refresh the CSV data in the table."""
-        try:
-            import csv
+    def _read_koli_rows(self, csv_file):
+        """Yield Koli table rows from the device log CSV as value tuples."""
+        with open(csv_file, 'r', newline='', encoding='utf-8') as file:
+            csv_reader = csv.reader(file)
+            header = next(csv_reader, None)
+            if not header:
+                return
+            
+            # Resolve column positions once instead of a dict lookup per field per row
+            positions = [header.index(column) if column in header else None for column in KOLI_COLUMNS]
             
+            for row in csv_reader:
+                if not row:
+                    continue
+                row_len = len(row)
+                yield tuple(row[pos] if pos is not None and pos < row_len else ''
+                            for pos in positions)
+    
+    def refresh_csv_data(self, search_term=""):
+        """Reload the Koli table from the CSV, keeping only rows matching search_term if given."""
+        try:
             # Clear existing data
-            for item in self.csv_tree.get_children():
-                self.csv_tree.delete(item)
+            self.csv_tree.delete(*self.csv_tree.get_children())
             
             csv_file = os.path.join("save", "csv", "device_log.csv")
             if not os.path.exists(csv_file):
-                self.csv_status_label.config(text="CSV file not found")
-                self.csv_info_label.config(text="No data")
+                if not search_term:
+                    self.csv_status_label.config(text="CSV file not found")
+                    self.csv_info_label.config(text="No data")
                 return
             
-            # Read CSV data
-            with open(csv_file, 'r', newline='', encoding='utf-8') as file:
-                csv_reader = csv.DictReader(file)
-                rows = list(csv_reader)
-                
-                # Sort by timestamp (most recent first)
-                rows.sort(key=lambda x: x.get('TIMESTAMP', ''), reverse=True)
-                
-                # Insert data into treeview
-                for row in rows:
-                    values = (
-                        row.get('timestamp', ''),
-                        row.get('serial_number', ''),
-                        row.get('imei', ''),
-                        row.get('imsi', ''),
-                        row.get('ccid', ''),
-                        row.get('mac_address', ''),
-                        row.get('stc', ''),
-                        row.get('print_status', ''),
-                        row.get('zpl_file', ''),
-                        row.get('raw_data', '')
-                    )
-                    self.csv_tree.insert("", "end", values=values)
-                
-                self.csv_status_label.config(text=f"Loaded {len(rows)} records")
-                self.csv_info_label.config(text=f"Total: {len(rows)} records")
+            # Stream CSV rows straight into the treeview; search every column up to print status
+            rows = self._read_koli_rows(csv_file)
+            if search_term:
+                rows = (values for values in rows
+                        if search_term in ' '.join(values[:KOLI_SEARCH_COLUMNS]).lower())
+            
+            row_count = 0
+            for row_count, values in enumerate(rows, 1):
+                self.csv_tree.insert("", "end", values=values)
+            
+            if search_term:
+                self.csv_info_label.config(text=f"Showing: {row_count} records")
+            else:
+                self.csv_status_label.config(text=f"Loaded {row_count} records")
+                self.csv_info_label.config(text=f"Total: {row_count} records")
                 
         except Exception as e:
-            self.csv_status_label.config(text=f"Error loading CSV: {e}")
-            messagebox.showerror("Error", f"Failed to load CSV data: {e}")
+            if search_term:
+                self.csv_status_label.config(text=f"Error filtering data: {e}")
+            else:
+                self.csv_status_label.config(text=f"Error loading CSV: {e}")
+                messagebox.showerror("Error", f"Failed to load CSV data: {e}")
     
     def filter_csv_data(self, *args):
         """Filter CSV data based on search term."""
-        try:
-            search_term = self.csv_search_var.get().lower()
-            
-            # If no search term, refresh all data
-            if not search_term:
-                self.refresh_csv_data()
-                return
-            
-            # Clear current display
-            for item in self.csv_tree.get_children():
-                self.csv_tree.delete(item)
-            
-            csv_file = os.path.join("save", "csv", "device_log.csv")
-            if not os.path.exists(csv_file):
-                return
-            
-            # Read and filter CSV data
-            import csv
-            with open(csv_file, 'r', newline='', encoding='utf-8') as file:
-                csv_reader = csv.DictReader(file)
-                filtered_rows = []
-                
-                for row in csv_reader:
-                    # Search in all relevant fields
-                    searchable_text = ' '.join([
-                        row.get('timestamp', ''),
-                        row.get('serial_number', ''),
-                        row.get('imei', ''),
-                        row.get('imsi', ''),
-                        row.get('ccid', ''),
-                        row.get('mac_address', ''),
-                        row.get('stc', ''),
-                        row.get('print_status', '')
-                    ]).lower()
-                    
-                    if search_term in searchable_text:
-                        filtered_rows.append(row)
-                
-                # Sort by timestamp (most recent first)
-                filtered_rows.sort(key=lambda x: x.get('TIMESTAMP', ''), reverse=True)
-                
-                # Insert filtered data
-                for row in filtered_rows:
-                    values = (
-                        row.get('timestamp', ''),
-                        row.get('serial_number', ''),
-                        row.get('imei', ''),
-                        row.get('imsi', ''),
-                        row.get('ccid', ''),
-                        row.get('mac_address', ''),
-                        row.get('stc', ''),
-                        row.get('print_status', ''),
-                        row.get('zpl_file', ''),
-                        row.get('raw_data', '')
-                    )
-                    self.csv_tree.insert("", "end", values=values)
-                
-                self.csv_info_label.config(text=f"Showing: {len(filtered_rows)} records")
-                
-        except Exception as e:
-            self.csv_status_label.config(text=f"Error filtering data: {e}")
+        self.refresh_csv_data(self.csv_search_var.get().lower())
     
     def export_csv_data(self):
         """Export filtered CSV data to a new file."""
@@ -2385,30 +2465,13 @@ class AutoPrinterGUI:
     
     def show_about(self):
         """Show about dialog."""
-        about_text = """Zebra & XPrinter Auto-Printer GUI
-        
-Version: 2.1
-Date: December 2024
-
-Features:
-- Multi-printer support (Zebra GC420T & XPrinter)
-- Simultaneous dual printing (Label + PCB)
-- Dual-mode operation (Auto-Print / Queue)
-- Real-time serial monitoring  
-- CSV data logging and viewing
-- ZPL template management
-- Comprehensive statistics
-
-For support and updates, check the project documentation."""
-        
-        messagebox.showinfo("About", about_text)
+        messagebox.showinfo("About", ABOUT_TEXT)
     
     def clear_pcb_log(self):
         """Clear the PCB log entries from the unified table."""
         try:
             # Clear all entries from the unified data table
-            for item in self.data_tree.get_children():
-                self.data_tree.delete(item)
+            self.data_tree.delete(*self.data_tree.get_children())
             self.log_message("Device log cleared", "INFO")
         except Exception as e:
             self.log_message(f"Error clearing device log: {e}", "ERROR")
@@ -2426,8 +2489,7 @@ For support and updates, check the project documentation."""
             # Keep only last 100 entries
             children = self.data_tree.get_children()
             if len(children) > 100:
-                for child in children[100:]:
-                    self.data_tree.delete(child)
+                self.data_tree.delete(*children[100:])
                     
         except Exception as e:
             self.log_message(f"Error adding PCB to table: {e}", "ERROR")
@@ -2455,16 +2517,21 @@ For support and updates, check the project documentation."""
             return
             
         try:
-            # Try to load CSV with different encodings
-            encodings = ['utf-8', 'utf-8-sig', 'latin1', 'cp1252']
+            with open(csv_path, 'rb') as f:
+                raw = f.read()
+            
+            # Detect the encoding once, then parse once; utf-8-sig also reads plain UTF-8
+            encodings = ['utf-8-sig', 'latin1', 'cp1252']
             for encoding in encodings:
                 try:
-                    self.box_devices_df = pd.read_csv(csv_path, encoding=encoding)
+                    text = raw.decode(encoding)
                     break
                 except UnicodeDecodeError:
                     continue
             else:
                 raise Exception("Could not decode CSV file with any encoding")
+            
+            self.box_devices_df = pd.read_csv(io.StringIO(text))
                 
             # Ensure all required columns exist
             # The CSV structure is: [timestamp, stc, serial_number, imei, imsi, ccid, mac_address, print_status, parse_status, ...]
@@ -2481,10 +2548,10 @@ For support and updates, check the project documentation."""
                 else:
                     self.box_devices_df.iloc[:, 6] = self.box_devices_df.iloc[:, 6].fillna('Available')
                 
+            self._box_search_index = None
             self.box_current_page = 0
             self.box_selected_devices = []
             self.update_box_device_display()
-            self.update_box_data_info()
             self.box_status_label.config(text=f"✅ Loaded {len(self.box_devices_df)} devices from CSV")
             self.log_message(f"Loaded {len(self.box_devices_df)} devices for box labels", "INFO")
             
@@ -2523,13 +2590,13 @@ For support and updates, check the project documentation."""
         # Create empty DataFrame with required columns
         columns = ['STC', 'SERIAL_NUMBER', 'IMEI', 'IMSI', 'CCID', 'MAC_ADDRESS', 'STATUS']
         self.box_devices_df = pd.DataFrame(columns=columns)
+        self._box_search_index = None
         
         self.box_current_page = 0
         self.box_selected_devices = []
         self.box_csv_path_var.set("")
         
         self.update_box_device_display()
-        self.update_box_data_info()
         self.box_status_label.config(text="📝 New CSV created - Add devices manually")
         self.log_message("Created new CSV for box labels", "INFO")
     
@@ -2541,9 +2608,9 @@ For support and updates, check the project documentation."""
                 # Add to DataFrame
                 new_row = pd.DataFrame([dialog], columns=self.box_devices_df.columns)
                 self.box_devices_df = pd.concat([self.box_devices_df, new_row], ignore_index=True)
+                self._box_search_index = None
                 
                 self.update_box_device_display()
-                self.update_box_data_info()
                 self.box_status_label.config(text="✅ Device added successfully")
                 self.log_message("Added new device to box data", "INFO")
                 
@@ -2572,6 +2639,7 @@ For support and updates, check the project documentation."""
                 # Update DataFrame
                 for col, value in dialog.items():
                     self.box_devices_df.at[global_idx, col] = value
+                self._box_search_index = None
                 
                 self.update_box_device_display()
                 self.box_status_label.config(text="✅ Device updated successfully")
@@ -2608,6 +2676,7 @@ For support and updates, check the project documentation."""
                 # Delete rows
                 for idx in indices_to_delete:
                     self.box_devices_df = self.box_devices_df.drop(idx).reset_index(drop=True)
+                self._box_search_index = None
                 
                 # Clear selection
                 for idx in indices_to_delete:
@@ -2615,7 +2684,6 @@ For support and updates, check the project documentation."""
                         self.box_selected_devices.remove(idx)
                 
                 self.update_box_device_display()
-                self.update_box_data_info()
                 self.box_status_label.config(text=f"✅ Deleted {len(indices_to_delete)} device(s)")
                 self.log_message(f"Deleted {len(indices_to_delete)} devices from box data", "INFO")
                 
@@ -2637,7 +2705,7 @@ For support and updates, check the project documentation."""
             
             # Get current data and modify serial number
             current_data = self.box_devices_df.iloc[global_idx].to_dict()
-            current_data['SERIAL_NUMBER'] = current_data['SERIAL_NUMBER'] + "_COPY"
+            current_data['SERIAL_NUMBER'] = f"{current_data['SERIAL_NUMBER']}_COPY"
             if 'STC' in current_data:
                 # Auto-increment STC
                 max_stc = self.box_devices_df['STC'].max() if len(self.box_devices_df) > 0 else 60000
@@ -2649,9 +2717,9 @@ For support and updates, check the project documentation."""
                 # Add to DataFrame
                 new_row = pd.DataFrame([dialog], columns=self.box_devices_df.columns)
                 self.box_devices_df = pd.concat([self.box_devices_df, new_row], ignore_index=True)
+                self._box_search_index = None
                 
                 self.update_box_device_display()
-                self.update_box_data_info()
                 self.box_status_label.config(text="✅ Device duplicated successfully")
                 self.log_message("Duplicated device in box data", "INFO")
                 
@@ -2699,7 +2767,7 @@ For support and updates, check the project documentation."""
             
             if field == 'STATUS':
                 # Combobox for status
-                entry = ttk.Combobox(main_frame, values=['Available', 'Used', 'Reserved', 'Defective'], width=30)
+                entry = ttk.Combobox(main_frame, values=DEVICE_STATUS_VALUES, width=30)
                 entry.set(current_data.get(field, 'Available') if current_data else 'Available')
             else:
                 # Regular entry
@@ -2775,8 +2843,20 @@ For support and updates, check the project documentation."""
             finally:
                 context_menu.grab_release()
     
-    def update_box_data_info(self):
-        """Update the data information display."""
+    def _box_filter_mask(self, search_term):
+        """Return a mask of box rows where any column contains search_term."""
+        if self._box_search_index is None:
+            # Build one lowercased string per row once; the unit separator keeps a
+            # match from spanning two columns, and na_rep keeps rows with blank
+            # cells (NaN even after astype(str) on newer pandas) searchable
+            frame = self.box_devices_df.astype(str)
+            self._box_search_index = frame.iloc[:, 0].str.cat(
+                [frame.iloc[:, i] for i in range(1, len(frame.columns))], sep="\x1f", na_rep=""
+            ).str.lower()
+        return self._box_search_index.str.contains(search_term, regex=False, na=False).to_numpy(dtype=bool)
+    
+    def update_box_data_info(self, filtered_count=None):
+        """Update the data information display, reusing filtered_count if the caller has it."""
         if self.box_devices_df is None:
             self.box_data_info_label.config(text="Total: 0 | Filtered: 0")
             return
@@ -2784,14 +2864,12 @@ For support and updates, check the project documentation."""
         total_count = len(self.box_devices_df)
         
         # Apply search filter to count filtered items
-        search_term = self.box_filter_var.get().strip().lower()
-        if search_term:
-            mask = self.box_devices_df.astype(str).apply(
-                lambda x: x.str.lower().str.contains(search_term, na=False)
-            ).any(axis=1)
-            filtered_count = len(self.box_devices_df[mask])
-        else:
-            filtered_count = total_count
+        if filtered_count is None:
+            search_term = self.box_filter_var.get().strip().lower()
+            if search_term:
+                filtered_count = int(self._box_filter_mask(search_term).sum())
+            else:
+                filtered_count = total_count
         
         self.box_data_info_label.config(text=f"Total: {total_count} | Filtered: {filtered_count}")
             
@@ -2800,27 +2878,25 @@ For support and updates, check the project documentation."""
         if self.box_devices_df is None:
             return
             
-        # Clear existing items
-        for item in self.box_tree.get_children():
-            self.box_tree.delete(item)
-        
         # Apply search filter
         search_term = self.box_filter_var.get().strip().lower()
         if search_term:
             # Search across all columns using positional data
-            mask = self.box_devices_df.astype(str).apply(
-                lambda x: x.str.lower().str.contains(search_term, na=False)
-            ).any(axis=1)
+            mask = self._box_filter_mask(search_term)
             filtered_df = self.box_devices_df[mask].reset_index(drop=True)
         else:
-            filtered_df = self.box_devices_df.copy()
+            filtered_df = self.box_devices_df  # only read below, no copy needed
             
         # Calculate page info
         total_devices = len(filtered_df)
         total_pages = (total_devices + self.box_devices_per_page - 1) // self.box_devices_per_page if total_devices > 0 else 1
         
         if total_devices == 0:
+            self.box_tree.delete(*self.box_tree.get_children())
+            self.box_rendered_rows = []
             self.box_page_label.config(text="Page: 0/0")
+            self.box_selection_label.config(text=f"Selected: {len(self.box_selected_devices)}/20")
+            self.update_box_data_info(total_devices)
             return
             
         # Ensure current page is valid
@@ -2832,28 +2908,44 @@ For support and updates, check the project documentation."""
         end_idx = min(start_idx + self.box_devices_per_page, total_devices)
         page_devices = filtered_df.iloc[start_idx:end_idx]
         
-        # Add devices to tree
-        for idx, (_, device) in enumerate(page_devices.iterrows()):
-            global_idx = start_idx + idx
-            is_selected = global_idx in self.box_selected_devices
+        # Build the rows for this page; loop invariants are bound once
+        selected = set(self.box_selected_devices)
+        column_count = len(page_devices.columns)
+        rows = []
+        append_row = rows.append
+        for global_idx, device in enumerate(page_devices.itertuples(index=False, name=None), start_idx):
+            is_selected = global_idx in selected
             
             # Get all values for the enhanced table - CORRECTED for actual CSV structure:
             # CSV headers: [timestamp,stc,serial_number,imei,imsi,ccid,mac_address,print_status,parse_status,raw_data,zpl_filename,notes]
             # Data positions: [timestamp,stc,serial_number,imei,imsi,ccid,mac_address,print_status,parse_status,...]
             values = (
                 "☑" if is_selected else "☐",
-                str(device.iloc[1]) if len(device) > 1 else "N/A",  # STC (second column: index 1)
-                str(device.iloc[2]) if len(device) > 2 else "",     # Serial (third column: index 2)
-                str(device.iloc[3]) if len(device) > 3 else "",     # IMEI (fourth column: index 3)
-                str(device.iloc[4]) if len(device) > 4 else "",     # IMSI (fifth column: index 4)
-                str(device.iloc[5]) if len(device) > 5 else "",     # CCID (sixth column: index 5)
-                str(device.iloc[6]) if len(device) > 6 else "",     # MAC (seventh column: index 6)
-                str(device.iloc[7]) if len(device) > 7 else "Available",  # Print Status (eighth column: index 7)
+                str(device[1]) if column_count > 1 else "N/A",  # STC (second column: index 1)
+                str(device[2]) if column_count > 2 else "",     # Serial (third column: index 2)
+                str(device[3]) if column_count > 3 else "",     # IMEI (fourth column: index 3)
+                str(device[4]) if column_count > 4 else "",     # IMSI (fifth column: index 4)
+                str(device[5]) if column_count > 5 else "",     # CCID (sixth column: index 5)
+                str(device[6]) if column_count > 6 else "",     # MAC (seventh column: index 6)
+                str(device[7]) if column_count > 7 else "Available",  # Print Status (eighth column: index 7)
                 global_idx  # Hidden column for global index
             )
             
-            self.box_tree.insert("", tk.END, values=values, 
-                               tags=('selected' if is_selected else 'unselected',))
+            append_row((values, ('selected' if is_selected else 'unselected',)))
+            
+        # Only touch the tree when the rendered rows changed
+        if rows != self.box_rendered_rows:
+            children = self.box_tree.get_children()
+            if len(children) == len(rows) == len(self.box_rendered_rows):
+                # Same page shape (e.g. a toggled checkbox): update changed rows in place
+                for item_id, row, old_row in zip(children, rows, self.box_rendered_rows):
+                    if row != old_row:
+                        self.box_tree.item(item_id, values=row[0], tags=row[1])
+            else:
+                self.box_tree.delete(*children)
+                for values, tags in rows:
+                    self.box_tree.insert("", tk.END, values=values, tags=tags)
+            self.box_rendered_rows = rows
             
         # Configure tags
         self.box_tree.tag_configure('selected', background='lightblue')
@@ -2862,13 +2954,7 @@ For support and updates, check the project documentation."""
         # Update labels
         self.box_page_label.config(text=f"Page: {self.box_current_page + 1}/{total_pages}")
         self.box_selection_label.config(text=f"Selected: {len(self.box_selected_devices)}/20")
-        self.update_box_data_info()
-        self.box_tree.tag_configure('selected', background='lightblue')
-        self.box_tree.tag_configure('unselected', background='white')
-        
-        # Update labels
-        self.box_page_label.config(text=f"Page: {self.box_current_page + 1}/{total_pages}")
-        self.box_selection_label.config(text=f"Selected: {len(self.box_selected_devices)}/20")
+        self.update_box_data_info(total_devices)
         
     def on_box_tree_click(self, event):
         """Handle box tree item clicks for selection."""
@@ -2892,9 +2978,9 @@ For support and updates, check the project documentation."""
             # Try to get global_idx from the last position
             try:
                 global_idx = int(values[-1])  # Get from last position instead of fixed index 8
-                print(f"Debug: Got global_idx: {global_idx}")
+                print("Debug: Got global_idx:", global_idx)
             except (ValueError, IndexError) as e:
-                print(f"Debug: Error getting global_idx: {e}")
+                print("Debug: Error getting global_idx:", e)
                 return
             
             # Toggle selection
@@ -2912,8 +2998,7 @@ For support and updates, check the project documentation."""
             self.update_box_device_display()
             
         except Exception as e:
-            print(f"Debug: Exception in on_box_tree_click: {e}")
-            import traceback
+            print("Debug: Exception in on_box_tree_click:", e)
             traceback.print_exc()
         
     def box_previous_page(self):
@@ -2954,23 +3039,19 @@ For support and updates, check the project documentation."""
         self.box_selected_devices = []
         self.update_box_device_display()
                 
-    def create_box_qr_with_devices(self, devices):
-        """Create QR code with all device data for box label."""
-        qr_data = []
-        for device in devices:
-            # Ensure all values are strings to avoid numpy type issues
-            stc = str(device.get('STC', 'N/A'))
-            serial = str(device.get('SERIAL_NUMBER', 'N/A'))
-            imei = str(device.get('IMEI', 'N/A'))
-            imsi = str(device.get('IMSI', 'N/A'))
-            ccid = str(device.get('CCID', 'N/A'))
-            mac = str(device.get('MAC_ADDRESS', 'N/A'))
-            
-            # Include ALL device information in QR code
-            device_info = f"{stc}:{serial}:{imei}:{imsi}:{ccid}:{mac}"
-            qr_data.append(device_info)
+    @staticmethod
+    def _format_box_qr_row(device):
+        """Format one device as an STC:SERIAL:IMEI:IMSI:CCID:MAC row for the box QR code."""
+        # Ensure all values are strings to avoid numpy type issues
+        return ":".join(str(device.get(key, 'N/A')) for key in BOX_DEVICE_KEYS)
         
-        qr_string = "|".join(qr_data)
+    def _build_box_qr(self, devices):
+        """Build the QR code holding all device data for a box label."""
+        import qrcode
+        
+        # Rows are preformatted when the device dicts are built; just join them
+        qr_string = "|".join(device.get('QR_ROW') or self._format_box_qr_row(device)
+                             for device in devices)
         
         qr = qrcode.QRCode(
             version=None,
@@ -2980,91 +3061,99 @@ For support and updates, check the project documentation."""
         )
         qr.add_data(qr_string)
         qr.make(fit=True)
+        return qr
+        
+    def _draw_box_qr(self, c, devices):
+        """Draw the box QR code as vector rectangles (no PNG round-trip)."""
+        matrix = self._build_box_qr(devices).get_matrix()  # includes the border
+        module = BOX_LABEL_QR_SIZE / len(matrix)
+        top = BOX_LABEL_QR_Y + BOX_LABEL_QR_SIZE
+        
+        path = c.beginPath()
+        for row_index, row in enumerate(matrix):
+            y = top - (row_index + 1) * module
+            col = 0
+            row_len = len(row)
+            while col < row_len:
+                if not row[col]:
+                    col += 1
+                    continue
+                # Merge horizontal runs of dark modules into one rectangle
+                run_start = col
+                while col < row_len and row[col]:
+                    col += 1
+                path.rect(BOX_LABEL_QR_X + run_start * module, y, (col - run_start) * module, module)
         
-        qr_image = qr.make_image(fill_color="black", back_color="white")
-        temp_path = f"temp_gui_qr_{datetime.now().strftime('%H%M%S_%f')}.png"
-        qr_image.save(temp_path)
-        return temp_path
+        c.setFillColor(black)
+        c.drawPath(path, stroke=0, fill=1)
         
     def generate_box_label_pdf(self, devices, box_number):
         """Generate box label PDF using optimized template."""
-        width = 10 * cm
-        height = 15 * cm
+        from reportlab.pdfgen import canvas
         
         # Ensure box labels folder exists
         box_labels_folder = os.path.join("save", "box_labels")
         os.makedirs(box_labels_folder, exist_ok=True)
         
         # Create filename with box number and date
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        now = datetime.now()
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
+        date_str = now.strftime('%d/%m/%Y')
         filename = f"{box_number.lower()}_{timestamp}.pdf"
         filepath = os.path.join(box_labels_folder, filename)
         
-        c = canvas.Canvas(filepath, pagesize=(width, height))
-        
-        # QR code at top, 1cm from edge
-        y = height - 10*mm
-        qr_path = self.create_box_qr_with_devices(devices)
-        qr_size = 40*mm
-        qr_x = (width - qr_size) / 2
-        qr_y = y - qr_size
+        c = canvas.Canvas(filepath, pagesize=(BOX_LABEL_WIDTH, BOX_LABEL_HEIGHT))
+        self._draw_box_label_page(c, devices, box_number, date_str)
+        c.save()
+        return filepath
         
-        c.drawImage(qr_path, qr_x, qr_y, width=qr_size, height=qr_size)
+    def _draw_box_label_page(self, c, devices, box_number, date_str):
+        """Draw one box label page at the precomputed layout positions."""
+        center_x = BOX_LABEL_WIDTH / 2
         
-        # Clean up QR
-        try:
-            os.remove(qr_path)
-        except:
-            pass
-            
-        # Header section below QR
-        y = qr_y - 6*mm
+        # QR code at top, 1cm from edge
+        self._draw_box_qr(c, devices)
         
         # Company name
         c.setFont("Helvetica-Bold", 10)
-        c.drawCentredString(width/2, y, "STC - SICAKLIK TAKIP CIHAZI")
-        y -= 6*mm
+        c.drawCentredString(center_x, BOX_LABEL_TITLE_Y, "STC - SICAKLIK TAKIP CIHAZI")
         
         # Date and box
         c.setFont("Helvetica", 8)
-        c.drawCentredString(width/2, y, f"{datetime.now().strftime('%d/%m/%Y')} - {box_number}")
-        y -= 6*mm
-        
-        # Device list section
-        y -= 3*mm
+        c.drawCentredString(center_x, BOX_LABEL_DATE_Y, f"{date_str} - {box_number}")
         
         # Device list header
         c.setFont("Helvetica-Bold", 7)
-        c.drawCentredString(width/2, y, "DEVICE LIST")
-        y -= 5*mm
+        c.drawCentredString(center_x, BOX_LABEL_LIST_Y, "DEVICE LIST")
         
         # Column headers
         c.setFont("Helvetica-Bold", 6)
-        c.drawString(3*mm, y, "STC")  # Changed from "No." to "STC"
-        c.drawString(12*mm, y, "Serial Number")  # Shifted right to make room for STC
-        c.drawString(42*mm, y, "IMEI")
-        c.drawString(70*mm, y, "MAC")
-        y -= 4*mm
-        
-        # Device entries
-        c.setFont("Courier", 5.5)
-        line_height = 3*mm
-        
-        for device in devices:  # Removed enumerate since we're using STC
-            if y > 5*mm:
-                stc = str(device.get('STC', 'N/A'))  # Get actual STC number
-                c.drawString(3*mm, y, stc)  # Print STC instead of sequential number
-                c.drawString(12*mm, y, str(device['SERIAL_NUMBER']))  # Shifted right
-                c.drawString(42*mm, y, str(device['IMEI']))
-                c.drawString(70*mm, y, str(device['MAC_ADDRESS']))
-                y -= line_height
-            else:
-                c.setFont("Helvetica", 5)
-                c.drawCentredString(width/2, y, "... (complete data in QR code)")
-                break
-                
-        c.save()
-        return filepath
+        stc_x, serial_x, imei_x, mac_x = BOX_LABEL_COLUMN_X
+        c.drawString(stc_x, BOX_LABEL_COLUMNS_Y, "STC")
+        c.drawString(serial_x, BOX_LABEL_COLUMNS_Y, "Serial Number")
+        c.drawString(imei_x, BOX_LABEL_COLUMNS_Y, "IMEI")
+        c.drawString(mac_x, BOX_LABEL_COLUMNS_Y, "MAC")
+        
+        # Device entries: one text object, font set once for all rows
+        rows = c.beginText()
+        rows.setFont("Courier", 5.5)
+        y = BOX_LABEL_ROWS_Y
+        
+        for device in devices[:BOX_LABEL_MAX_ROWS]:
+            rows.setTextOrigin(stc_x, y)
+            rows.textOut(str(device.get('STC', 'N/A')))
+            rows.setTextOrigin(serial_x, y)
+            rows.textOut(str(device['SERIAL_NUMBER']))
+            rows.setTextOrigin(imei_x, y)
+            rows.textOut(str(device['IMEI']))
+            rows.setTextOrigin(mac_x, y)
+            rows.textOut(str(device['MAC_ADDRESS']))
+            y -= BOX_LABEL_LINE_HEIGHT
+        c.drawText(rows)
+        
+        if len(devices) > BOX_LABEL_MAX_ROWS:
+            c.setFont("Helvetica", 5)
+            c.drawCentredString(center_x, y, "... (complete data in QR code)")
         
     def create_box_pdf_label(self):
         """Create box label PDF for selected devices."""
@@ -3085,48 +3174,64 @@ For support and updates, check the project documentation."""
             return
             
         try:
-            # Get selected device data
-            selected_device_data = []
-            for idx in sorted(self.box_selected_devices):
-                device_row = self.box_devices_df.iloc[idx]
-                # CSV structure: timestamp,stc,serial_number,imei,imsi,ccid,mac_address,print_status,parse_status,raw_data,zpl_filename,notes
-                device_dict = {
-                    'STC': str(device_row.iloc[1]) if len(device_row) > 1 else 'N/A',  # STC (2nd column)
-                    'SERIAL_NUMBER': str(device_row.iloc[2]) if len(device_row) > 2 else 'N/A',  # Serial (3rd column)
-                    'IMEI': str(device_row.iloc[3]) if len(device_row) > 3 else 'N/A',  # IMEI (4th column)
-                    'IMSI': str(device_row.iloc[4]) if len(device_row) > 4 else 'N/A',  # IMSI (5th column)
-                    'CCID': str(device_row.iloc[5]) if len(device_row) > 5 else 'N/A',  # CCID (6th column)
-                    'MAC_ADDRESS': str(device_row.iloc[6]) if len(device_row) > 6 else 'N/A'  # MAC (7th column)
-                }
-                selected_device_data.append(device_dict)
-                
-            # Generate PDF
-            filepath = self.generate_box_label_pdf(selected_device_data, box_number)
-            
-            # Log success
-            self.log_message(f"✅ Box label created: {os.path.basename(filepath)} ({len(selected_device_data)} devices)", "INFO")
-            
-            # Show success message
-            messagebox.showinfo("Success", 
-                              f"Box label created successfully!\n\n"
-                              f"File: {os.path.basename(filepath)}\n"
-                              f"Location: save/box_labels/\n"
-                              f"Devices: {len(selected_device_data)}\n"
-                              f"Box: {box_number}")
-                              
-            # Clear selection
-            self.box_selected_devices = []
-            self.update_box_device_display()
-            
-            # Auto-increment box number
-            if box_number.startswith("BOX") and box_number[3:].isdigit():
-                new_number = int(box_number[3:]) + 1
-                self.box_number_var.set(f"BOX{new_number:03d}")
+            # Get selected device data in one slice instead of row by row
+            # CSV structure: timestamp,stc,serial_number,imei,imsi,ccid,mac_address,print_status,parse_status,raw_data,zpl_filename,notes
+            device_frame = self.box_devices_df.iloc[sorted(self.box_selected_devices), 1:7].astype(str)
+            device_frame.columns = BOX_DEVICE_KEYS[:device_frame.shape[1]]
+            device_frame = device_frame.reindex(columns=list(BOX_DEVICE_KEYS), fill_value='N/A')
+            selected_device_data = device_frame.to_dict('records')
+            for device_dict in selected_device_data:
+                device_dict['QR_ROW'] = self._format_box_qr_row(device_dict)
                 
         except Exception as e:
             error_msg = f"Failed to create box label: {str(e)}"
             self.log_message(error_msg, "ERROR")
             messagebox.showerror("Error", error_msg)
+            return
+            
+        # Generate PDF off the Tk thread; the result comes back through gui_queue
+        self.box_create_button.config(state='disabled')
+        worker = threading.Thread(target=self._box_label_worker,
+                                  args=(selected_device_data, box_number), daemon=True)
+        worker.start()
+        
+    def _box_label_worker(self, devices, box_number):
+        """Generate a box label PDF in a background thread."""
+        try:
+            filepath = self.generate_box_label_pdf(devices, box_number)
+            self.gui_queue.put(('box_label_done', (filepath, len(devices), box_number, None)))
+        except Exception as e:
+            self.gui_queue.put(('box_label_done', (None, len(devices), box_number, str(e))))
+            
+    def on_box_label_done(self, filepath, device_count, box_number, error):
+        """Report a finished box label on the Tk thread."""
+        self.box_create_button.config(state='normal')
+        
+        if error:
+            error_msg = f"Failed to create box label: {error}"
+            self.log_message(error_msg, "ERROR")
+            messagebox.showerror("Error", error_msg)
+            return
+            
+        # Log success
+        self.log_message(f"✅ Box label created: {os.path.basename(filepath)} ({device_count} devices)", "INFO")
+        
+        # Show success message
+        messagebox.showinfo("Success", 
+                          f"Box label created successfully!\n\n"
+                          f"File: {os.path.basename(filepath)}\n"
+                          f"Location: save/box_labels/\n"
+                          f"Devices: {device_count}\n"
+                          f"Box: {box_number}")
+                          
+        # Clear selection
+        self.box_selected_devices = []
+        self.update_box_device_display()
+        
+        # Auto-increment box number
+        if box_number.startswith("BOX") and box_number[3:].isdigit():
+            new_number = int(box_number[3:]) + 1
+            self.box_number_var.set(f"BOX{new_number:03d}")
     
     # CSV Management Methods
     def get_csv_path(self):
@@ -3156,7 +3261,6 @@ For support and updates, check the project documentation."""
         try:
             # Read CSV data
             if os.path.exists(csv_path):
-                import pandas as pd
                 self.csv_data = pd.read_csv(csv_path)
                 
                 # Update statistics
@@ -3214,33 +3318,25 @@ For support and updates, check the project documentation."""
                     display_data = display_data[mask]
                 
                 # Clear and populate tree
-                for item in self.csv_tree.get_children():
-                    self.csv_tree.delete(item)
+                self.csv_tree.delete(*self.csv_tree.get_children())
                 
-                for _, row in display_data.iterrows():
-                    values = []
-                    # CSV structure: timestamp,stc,serial_number,imei,imsi,ccid,mac_address,print_status,parse_status,raw_data,zpl_filename,notes
-                    # Display order: Time, STC, Serial, IMEI, IMSI, CCID, MAC, Status
-                    
-                    # Map the correct data positions to display columns
-                    if len(row) >= 8:
-                        values.append(str(row.iloc[0]))  # timestamp
-                        values.append(str(row.iloc[1]))  # stc
-                        values.append(str(row.iloc[2]))  # serial_number
-                        values.append(str(row.iloc[3]))  # imei
-                        values.append(str(row.iloc[4]))  # imsi
-                        values.append(str(row.iloc[5]))  # ccid
-                        values.append(str(row.iloc[6]))  # mac_address
-                        values.append(str(row.iloc[7]))  # print_status
-                    else:
-                        values = ["N/A"] * 8
-                    
-                    # Color code rows - check parse_status (column 8, index 7)
-                    tag = "normal"
-                    if len(row) >= 9 and str(row.iloc[8]) == "PARSE_ERROR":  # parse_status column
-                        tag = "error"
-                    
-                    self.csv_tree.insert("", "end", values=values, tags=(tag,))
+                # Format all rows at once instead of per-row iterrows()
+                # CSV structure: timestamp,stc,serial_number,imei,imsi,ccid,mac_address,print_status,parse_status,raw_data,zpl_filename,notes
+                # Display order: Time, STC, Serial, IMEI, IMSI, CCID, MAC, Status
+                column_count = len(display_data.columns)
+                if column_count >= 8:
+                    rows = display_data.iloc[:, :8].astype(str).values.tolist()
+                else:
+                    rows = [["N/A"] * 8] * len(display_data)
+                
+                # Color code rows - check parse_status (column 9, index 8)
+                if column_count >= 9:
+                    error_flags = (display_data.iloc[:, 8].astype(str) == "PARSE_ERROR").tolist()
+                else:
+                    error_flags = [False] * len(display_data)
+                
+                for values, is_error in zip(rows, error_flags):
+                    self.csv_tree.insert("", "end", values=values, tags=("error" if is_error else "normal",))
                 
                 # Configure row colors
                 self.csv_tree.tag_configure("error", background="#ffcccc")
@@ -3256,8 +3352,7 @@ For support and updates, check the project documentation."""
                 self.csv_modified_label.config(text="Never")
                 
                 # Clear tree
-                for item in self.csv_tree.get_children():
-                    self.csv_tree.delete(item)
+                self.csv_tree.delete(*self.csv_tree.get_children())
                 
         except Exception as e:
             self.log_message(f"Error refreshing CSV view: {e}", "ERROR")
@@ -3301,17 +3396,12 @@ For support and updates, check the project documentation."""
             # Create backup before clearing
             backup_filename = f'device_log_backup_before_clear_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
             backup_path = os.path.join(self.save_folders['backups'], backup_filename)
-            import shutil
             shutil.copy2(csv_path, backup_path)
             
             # Clear CSV file - keep only headers
-            csv_headers = [
-                'timestamp', 'stc', 'serial_number', 'imei', 'imsi', 'ccid', 'mac_address',
-                'print_status', 'parse_status', 'raw_data', 'zpl_filename', 'notes'
-            ]
             with open(csv_path, 'w', newline='', encoding='utf-8') as csvfile:
                 writer = csv.writer(csvfile)
-                writer.writerow(csv_headers)
+                writer.writerow(CSV_HEADERS)
             
             # Reset STC counter in auto_printer if available
             if hasattr(self, 'auto_printer') and self.auto_printer:
@@ -3347,8 +3437,6 @@ For support and updates, check the project documentation."""
             return
         
         try:
-            import pandas as pd
-            
             # Read current data
             df = pd.read_csv(csv_path)
             original_count = len(df)
@@ -3397,8 +3485,6 @@ For support and updates, check the project documentation."""
             return
         
         try:
-            from tkinter import filedialog
-            
             # Get filtered data based on current view
             display_data = self.csv_data.copy()
             show_option = self.csv_show_var.get()
@@ -3441,6 +3527,9 @@ For support and updates, check the project documentation."""
         """Handle application closing."""
         if self.is_monitoring:
             self.stop_monitoring()
+        for printer in self._printer_instances.values():
+            printer.close()
+        self._printer_instances.clear()
         self.root.destroy()
 
 
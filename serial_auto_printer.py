@@ -109,7 +109,7 @@ class DeviceDataParser:
         for i, field_name in enumerate(self.field_names):
             value = values[i].strip()
             # Remove ATS prefix from serial number
-            if field_name == 'SERIAL_NUMBER' and value.upper().startswith('ATS'):
+            if field_name == 'SERIAL_NUMBER' and value[:3].upper() == 'ATS':
                 value = value[3:].strip()
             device_data[field_name] = value
         
@@ -151,16 +151,17 @@ class ZPLTemplate:
     
     def __init__(self, template: str):
         self.template = template
-        self.placeholders = re.findall(r'\{([A-Z_]+)\}', template)
+        # Split once into literal text (even indexes) and placeholder names (odd indexes)
+        self._segments = re.split(r'\{([A-Z_]+)\}', template)
+        self.placeholders = self._segments[1::2]
         logger.info(f"Template loaded with placeholders: {self.placeholders}")
     
     def render(self, device_data: Dict[str, str]) -> str:
         """Render ZPL template with device data."""
-        rendered = self.template
-        for placeholder in self.placeholders:
-            value = device_data.get(placeholder, f'MISSING_{placeholder}')
-            rendered = rendered.replace(f'{{{placeholder}}}', value)
-        return rendered
+        parts = self._segments[:]
+        for i in range(1, len(parts), 2):
+            parts[i] = device_data.get(parts[i], f'MISSING_{parts[i]}')
+        return "".join(parts)
     
     def validate_template(self, device_data: Dict[str, str]) -> bool:
         """Validate that all required placeholders have data."""
@@ -227,29 +228,35 @@ class SerialPortMonitor:
     
     def _monitor_loop(self):
         """Optimized monitoring loop."""
-        buffer = ""
+        # Raw bytes are appended in place and consumed with one slice delete per
+        # pass, so the buffer is reused instead of rebuilt on every split
+        buffer = bytearray()
         last_data_time = time.time()
         
         while self.is_running:
             try:
                 if self.serial_connection.in_waiting > 0:
-                    data = self.serial_connection.read(self.serial_connection.in_waiting)
-                    data_str = data.decode('utf-8', errors='ignore')
-                    buffer += data_str
+                    buffer += self.serial_connection.read(self.serial_connection.in_waiting)
                     last_data_time = time.time()
                 
                 # Process complete lines
-                for line_ending in ['\n', '\r\n', '\r']:
-                    while line_ending in buffer:
-                        line, buffer = buffer.split(line_ending, 1)
-                        if line.strip() and self.data_callback:
-                            self.data_callback(line.strip())
+                for line_ending in (b'\n', b'\r\n', b'\r'):
+                    start = 0
+                    end = buffer.find(line_ending)
+                    while end >= 0:
+                        line = buffer[start:end].decode('utf-8', errors='ignore').strip()
+                        if line and self.data_callback:
+                            self.data_callback(line)
+                        start = end + len(line_ending)
+                        end = buffer.find(line_ending, start)
+                    if start:
+                        del buffer[:start]
                 
                 # Handle timeout for incomplete data
                 if buffer and (time.time() - last_data_time) > 2.0:
                     if self.data_callback:
-                        self.data_callback(buffer.strip())
-                    buffer = ""
+                        self.data_callback(buffer.decode('utf-8', errors='ignore').strip())
+                    buffer.clear()
                     last_data_time = time.time()
                 
                 time.sleep(0.1)
@@ -268,20 +275,66 @@ class SerialPortMonitor:
                 for port in serial.tools.list_ports.comports()]
 
 
+def read_next_stc(csv_file_path: str, fallback_stc: int = 60000) -> int:
+    """Return the STC after the highest one logged in csv_file_path, or fallback_stc."""
+    try:
+        if not os.path.exists(csv_file_path):
+            return fallback_stc
+        
+        with open(csv_file_path, 'r', newline='', encoding='utf-8') as csvfile:
+            reader = csv.reader(csvfile)
+            header = next(reader, [])
+            stc_column = 'stc' if 'stc' in header else 'STC'
+            if stc_column not in header:
+                return fallback_stc
+            
+            # Only the STC column is looked at; no per-row dict is built
+            pos = header.index(stc_column)
+            max_stc = max((int(row[pos]) for row in reader
+                           if len(row) > pos and row[pos].isdigit()), default=0)
+        
+        return max_stc + 1 if max_stc > 0 else fallback_stc
+            
+    except Exception as e:
+        logger.warning(f"Error reading STC from CSV: {e}")
+        return fallback_stc
+
+
 class DeviceAutoPrinter:
     """Optimized main auto-printer class."""
     
+    # PCB label (40x20mm TSPL); only the serial number and STC vary per device
+    PCB_TSPL_TEMPLATE = """SIZE 40 mm, 20 mm
+GAP 2 mm, 0 mm
+DIRECTION 1
+REFERENCE 0, 0
+OFFSET 0 mm
+SET PEEL OFF
+SET CUTTER OFF
+SET PARTIAL_CUTTER OFF
+SET TEAR ON
+CLEAR
+TEXT 100, 55, "2", 0, 2, 2, "{serial_number}"
+TEXT 100, 105, "2", 0, 2, 2, "STC:{stc}"
+PRINT 1, 1
+"""
+    
     def __init__(self, zpl_template: str, serial_port: str = None, 
                  baudrate: int = 9600, printer_name: str = None, 
                  pcb_printer_name: str = None, initial_stc: int = 60000,
                  zpl_output_dir: str = None, csv_file_path: str = None, 
-                 debug_mode: bool = False):
+                 debug_mode: bool = False, printer: ZebraZPL = None,
+                 pcb_printer: ZebraZPL = None):
         
         self.debug_mode = debug_mode
         self.parser = DeviceDataParser()
         self.template = ZPLTemplate(zpl_template)
-        self.printer = ZebraZPL(printer_name, debug_mode=debug_mode)
-        self.pcb_printer = ZebraZPL(pcb_printer_name, debug_mode=debug_mode) if pcb_printer_name else None
+        # Callers that already hold printer instances pass them in to skip re-discovery
+        self.printer = printer or ZebraZPL(printer_name, debug_mode=debug_mode)
+        if pcb_printer is not None:
+            self.pcb_printer = pcb_printer
+        else:
+            self.pcb_printer = ZebraZPL(pcb_printer_name, debug_mode=debug_mode) if pcb_printer_name else None
         self.serial_monitor = SerialPortMonitor(serial_port, baudrate) if serial_port else None
         
         # File paths
@@ -316,23 +369,7 @@ class DeviceAutoPrinter:
     
     def _get_next_stc_from_csv(self, fallback_stc: int = 60000) -> int:
         """Get next STC from CSV history."""
-        try:
-            if not os.path.exists(self.csv_file_path):
-                return fallback_stc
-            
-            max_stc = 0
-            with open(self.csv_file_path, 'r', newline='', encoding='utf-8') as csvfile:
-                reader = csv.DictReader(csvfile)
-                for row in reader:
-                    stc_value = row.get('stc') or row.get('STC', '0')
-                    if stc_value.isdigit():
-                        max_stc = max(max_stc, int(stc_value))
-            
-            return max_stc + 1 if max_stc > 0 else fallback_stc
-                
-        except Exception as e:
-            logger.warning(f"Error reading STC from CSV: {e}")
-            return fallback_stc
+        return read_next_stc(self.csv_file_path, fallback_stc)
     
     def _ensure_directories(self):
         """Create required directories."""
@@ -388,7 +425,10 @@ class DeviceAutoPrinter:
         if device_index >= len(self.pending_devices):
             return False
         
-        device_entry = self.pending_devices[device_index]
+        return self.print_queue_entry(self.pending_devices[device_index], custom_stc)
+    
+    def print_queue_entry(self, device_entry: Dict, custom_stc: int = None) -> bool:
+        """Print a queued device entry, even if it has since left the queue."""
         device_data = device_entry['device_data'].copy()
         device_data['STC'] = str(custom_stc or device_entry['stc_assigned'])
         
@@ -406,16 +446,16 @@ class DeviceAutoPrinter:
         """Clear device queue."""
         self.pending_devices.clear()
     
-    def _save_zpl_file(self, device_data: Dict[str, str], zpl_commands: str) -> str:
-        """Save ZPL commands to file."""
+    def _save_zpl_file(self, device_data: Dict[str, str], zpl_payload: bytes) -> str:
+        """Save the encoded ZPL payload to file, byte for byte as sent to the printer."""
         try:
             serial_number = device_data.get('SERIAL_NUMBER', 'UNKNOWN')
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             filename = f"{serial_number}_{timestamp}.zpl"
             filepath = os.path.join(self.zpl_output_dir, filename)
             
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(zpl_commands)
+            with open(filepath, 'wb') as f:
+                f.write(zpl_payload)
             
             return filename
         except Exception as e:
@@ -478,11 +518,12 @@ class DeviceAutoPrinter:
                 self._log_to_csv(device_data, "TEMPLATE_ERROR", "", raw_data)
                 return False, "", stc_assigned, False
             
-            zpl_commands = self.template.render(device_data)
-            zpl_filename = self._save_zpl_file(device_data, zpl_commands)
+            # Encode once; the saved file and the print job share the same bytes
+            zpl_payload = self.template.render(device_data).encode('utf-8')
+            zpl_filename = self._save_zpl_file(device_data, zpl_payload)
             
             # Print main label
-            success = self.printer.send_zpl(zpl_commands)
+            success = self.printer.send_zpl(zpl_payload)
             
             # Print PCB label
             pcb_success = False
@@ -517,23 +558,10 @@ class DeviceAutoPrinter:
     
     def _create_pcb_label_data(self, device_data: Dict[str, str]) -> str:
         """Create optimized PCB label using TSPL."""
-        serial_number = device_data.get('SERIAL_NUMBER', 'UNKNOWN')
-        stc = device_data.get('STC', 'UNKNOWN')
-        
-        return f"""SIZE 40 mm, 20 mm
-GAP 2 mm, 0 mm
-DIRECTION 1
-REFERENCE 0, 0
-OFFSET 0 mm
-SET PEEL OFF
-SET CUTTER OFF
-SET PARTIAL_CUTTER OFF
-SET TEAR ON
-CLEAR
-TEXT 100, 55, "2", 0, 2, 2, "{serial_number}"
-TEXT 100, 105, "2", 0, 2, 2, "STC:{stc}"
-PRINT 1, 1
-"""
+        return self.PCB_TSPL_TEMPLATE.format(
+            serial_number=device_data.get('SERIAL_NUMBER', 'UNKNOWN'),
+            stc=device_data.get('STC', 'UNKNOWN')
+        )
     
     def start(self) -> bool:
         """Start the auto-printer system."""
@@ -622,16 +650,17 @@ def main():
     args = parser.parse_args()
     
     if args.list_ports:
-        print("Available serial ports:")
-        for port in SerialPortMonitor.list_serial_ports():
-            print(f"  {port['device']} - {port['description']}")
+        lines = ["Available serial ports:"]
+        lines.extend(f"  {port['device']} - {port['description']}"
+                     for port in SerialPortMonitor.list_serial_ports())
+        print("\n".join(lines))
         return
     
     if args.list_printers:
         printer = ZebraZPL()
-        print("Available printers:")
-        for p in printer.list_printers():
-            print(f"  {p}")
+        lines = ["Available printers:"]
+        lines.extend(f"  {p}" for p in printer.list_printers())
+        print("\n".join(lines))
         return
     
     # Create and run auto-printer
@@ -643,7 +672,7 @@ def main():
     )
     
     if args.test_data:
-        print(f"Testing with: {args.test_data}")
+        print("Testing with:", args.test_data)
         auto_printer._handle_serial_data(args.test_data)
         return
     
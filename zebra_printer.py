@@ -58,6 +58,9 @@ except ImportError:
         fitz = None
         PyPDF2 = None
 
+# Share the printer enumeration cache with the ZPL module
+from zebra_zpl import list_local_printers
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -88,21 +91,22 @@ class ZebraPrinter:
             if not self.printer_name:
                 self.printer_name = self._find_zebra_printer()
     
-    def _discover_printers(self) -> List[str]:
-        """Discover all available printers on the system."""
+    def _discover_printers(self, force: bool = False) -> List[str]:
+        """
+        Discover all available printers on the system.
+        
+        The printer list comes from zebra_zpl.list_local_printers, which shares
+        one cached enumeration with ZebraZPL.
+        
+        Args:
+            force (bool): If True, ignore the cache and enumerate again.
+        """
         if not win32print:
             logger.error("win32print not available")
             return []
         
-        printers = []
-        printer_enum = win32print.EnumPrinters(win32print.PRINTER_ENUM_LOCAL)
-        
-        for printer in printer_enum:
-            printers.append(printer[2])  # printer name
-        
-        self.available_printers = printers
-        logger.info(f"Found {len(printers)} printers: {', '.join(printers)}")
-        return printers
+        self.available_printers = list_local_printers(force)
+        return self.available_printers
     
     def _find_zebra_printer(self) -> Optional[str]:
         """Automatically find Zebra printer in the system."""
@@ -389,17 +393,17 @@ def main():
     if args.list_printers:
         print("Available printers:")
         for p in printer.list_printers():
-            print(f"  - {p}")
+            print("  -", p)
         return
     
     if not printer.printer_name:
         print("Error: No Zebra printer found. Available printers:")
         for p in printer.list_printers():
-            print(f"  - {p}")
+            print("  -", p)
         print("\nSpecify printer name with --printer option")
         return
     
-    print(f"Using printer: {printer.printer_name}")
+    print("Using printer:", printer.printer_name)
     
     # Print the PDF
     if printer.print_pdf(args.pdf_file, args.copies, args.dpi):
@@ -20,8 +20,10 @@ Date: August 2025
 import os
 import sys
 import logging
-from typing import Optional, List, Dict
-import datetime
+import re
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional, List, Dict, NamedTuple, Union
 
 try:
     import win32print
@@ -37,6 +39,88 @@ except ImportError:
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# EnumPrinters is a spooler RPC; list_local_printers shares its result across printer instances
+PRINTER_CACHE_TTL = 30.0  # seconds
+STATUS_CACHE_TTL = 1.0  # seconds; get_printer_status polls hit the spooler at most this often
+_PRINTER_CACHE = {'printers': None, 'ts': 0.0}
+
+# Printer names that identify a Zebra label printer
+_ZEBRA_RE = re.compile(r'zebra|gc420|zdesigner', re.IGNORECASE)
+
+# Above this size print_multiple writes one page per copy instead of one combined buffer
+MAX_COMBINED_PAYLOAD = 1_000_000  # bytes
+
+
+def list_local_printers(force: bool = False) -> List[str]:
+    """
+    Return the names of the local printers.
+    
+    The spooler is enumerated at most once per PRINTER_CACHE_TTL seconds; every
+    caller, ZebraZPL or ZebraPrinter, shares the same cached result.
+    
+    Args:
+        force (bool): If True, ignore the cache and enumerate again.
+        
+    Returns:
+        List[str]: A new list the caller is free to modify
+    """
+    now = time.monotonic()
+    printers = _PRINTER_CACHE['printers']
+    if force or printers is None or now - _PRINTER_CACHE['ts'] >= PRINTER_CACHE_TTL:
+        printers = [printer[2] for printer in win32print.EnumPrinters(win32print.PRINTER_ENUM_LOCAL)]
+        _PRINTER_CACHE['printers'] = printers
+        _PRINTER_CACHE['ts'] = now
+        logger.info(f"Found {len(printers)} printers: {', '.join(printers)}")
+    return list(printers)
+
+
+class ShippingAddress(NamedTuple):
+    """Sender or recipient block of a shipping label."""
+    name: str = ''
+    address1: str = ''
+    address2: str = ''
+    city_state_zip: str = ''
+
+
+def _as_address(info: Union[ShippingAddress, Dict]) -> ShippingAddress:
+    """Accept a ShippingAddress as is, or build one from a legacy address dict."""
+    if isinstance(info, ShippingAddress):
+        return info
+    return ShippingAddress(*(info.get(field, '') for field in ShippingAddress._fields))
+
+
+# Today's date string and the local midnight at which it goes stale
+_TODAY = {'date': '', 'until': 0.0}
+
+
+def _today_str() -> str:
+    """Return today's date as YYYY-MM-DD, formatting it once per day."""
+    now = time.time()
+    if now >= _TODAY['until']:
+        local = time.localtime(now)
+        _TODAY['date'] = time.strftime("%Y-%m-%d", local)
+        _TODAY['until'] = time.mktime((local.tm_year, local.tm_mon, local.tm_mday + 1,
+                                       0, 0, 0, 0, 0, -1))
+    return _TODAY['date']
+
+
+def _to_bytes(commands: Union[str, bytes]) -> bytes:
+    """Encode printer commands for WritePrinter; bytes pass through untouched."""
+    if isinstance(commands, (bytes, bytearray)):
+        return commands
+    # Labels are almost always pure ASCII; isascii() is a flag check on the str and
+    # the ASCII codec is a straight copy, with UTF-8 only for non-ASCII user data
+    if commands.isascii():
+        return commands.encode('ascii')
+    return commands.encode('utf-8')
+
+
+def _to_text(commands: Union[str, bytes]) -> str:
+    """Decode printer commands for logging and debug previews."""
+    if isinstance(commands, (bytes, bytearray)):
+        return commands.decode('utf-8', errors='replace')
+    return commands
+
 
 class ZebraZPL:
     """
@@ -46,6 +130,10 @@ class ZebraZPL:
     with text, barcodes, graphics, and precise formatting.
     """
     
+    # Shipping label field origins; optional address lines fill the slots in order
+    _SHIP_FROM_LINE_FIELDS = tuple(f"^FO20,{y}^ADN,14,7^FD" for y in (55, 73, 91))
+    _SHIP_TO_LINE_FIELDS = tuple(f"^FO20,{y}^ADN,16,8^FD" for y in (208, 228, 248))
+    
     def __init__(self, printer_name: str = None, debug_mode: bool = False):
         """
         Initialize the Zebra ZPL interface.
@@ -60,6 +148,9 @@ class ZebraZPL:
         self.printer_handle = None
         self.debug_mode = debug_mode
         self.last_print_data = None  # Store last print data for debugging
+        self._product_templates = {}  # (has_price, has_desc) -> compiled product label
+        self._executor = None  # single background writer, created by send_zpl_async
+        self._status_cache = (0.0, None, {})  # (time, printer name, status)
         
         # Default settings for GC420T
         self.dpi = 203  # GC420T resolution
@@ -75,28 +166,29 @@ class ZebraZPL:
             if not self.printer_name:
                 self.printer_name = self._find_zebra_printer()
     
-    def _discover_printers(self) -> List[str]:
-        """Discover all available printers on the system."""
+    def _discover_printers(self, force: bool = False) -> List[str]:
+        """
+        Discover all available printers on the system.
+        
+        The printer list comes from list_local_printers, so creating several
+        ZebraZPL instances does not re-enumerate the spooler.
+        
+        Args:
+            force (bool): If True, ignore the cache and enumerate again.
+        """
         if not WIN32_AVAILABLE:
             logger.error("win32print not available")
             return []
         
-        printers = []
-        printer_enum = win32print.EnumPrinters(win32print.PRINTER_ENUM_LOCAL)
-        
-        for printer in printer_enum:
-            printers.append(printer[2])  # printer name
-        
-        self.available_printers = printers
-        logger.info(f"Found {len(printers)} printers: {', '.join(printers)}")
-        return printers
+        self.available_printers = list_local_printers(force)
+        return self.available_printers
     
     def _find_zebra_printer(self) -> Optional[str]:
         """Automatically find Zebra printer in the system."""
-        for printer in self.available_printers:
-            if 'zebra' in printer.lower() or 'gc420' in printer.lower() or 'zdesigner' in printer.lower():
-                logger.info(f"Found Zebra printer: {printer}")
-                return printer
+        printer = next((p for p in self.available_printers if _ZEBRA_RE.search(p)), None)
+        if printer:
+            logger.info(f"Found Zebra printer: {printer}")
+            return printer
         
         logger.warning("No Zebra printer found automatically")
         return None
@@ -105,6 +197,20 @@ class ZebraZPL:
         """Return list of available printers."""
         return self.available_printers
     
+    def refresh_printers(self, force: bool = False) -> List[str]:
+        """
+        Re-discover available printers.
+        
+        Args:
+            force (bool): If True, enumerate again even if the shared cache is still fresh.
+            
+        Returns:
+            List[str]: Updated list of available printers
+        """
+        if self.debug_mode or not WIN32_AVAILABLE:
+            return self.available_printers
+        return self._discover_printers(force=force)
+    
     def set_printer(self, printer_name: str) -> bool:
         """
         Set the target printer for printing operations.
@@ -123,12 +229,83 @@ class ZebraZPL:
             logger.error(f"Printer '{printer_name}' not found")
             return False
     
-    def send_zpl(self, zpl_commands: str) -> bool:
+    def __enter__(self):
+        """Open the printer once so all jobs inside the ``with`` block reuse the handle."""
+        if WIN32_AVAILABLE and not self.debug_mode and self.printer_name and self.printer_handle is None:
+            try:
+                self.printer_handle = win32print.OpenPrinter(self.printer_name)
+            except Exception as e:
+                # Leave the handle unset; each job then opens the printer itself and reports the failure
+                logger.error(f"Error opening printer '{self.printer_name}': {e}")
+                self.printer_handle = None
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+    
+    def close(self):
+        """Finish queued async jobs and close the printer handle held by a ``with`` block, if any."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        
+        if self.printer_handle is not None:
+            try:
+                win32print.ClosePrinter(self.printer_handle)
+            finally:
+                self.printer_handle = None
+    
+    def _write_raw(self, payload: bytes, job_name: str, copies: int = 1) -> int:
+        """
+        Write a RAW payload as one spooler job with one page per copy.
+        
+        Uses the handle opened by ``with printer:`` when there is one, otherwise
+        opens and closes the printer around the job.
+        
+        Args:
+            payload (bytes): Encoded printer commands
+            job_name (str): Spooler document name
+            copies (int): Number of pages (copies) to write
+            
+        Returns:
+            int: Number of copies written; less than copies if the spooler failed
+        """
+        written = 0
+        try:
+            hprinter = self.printer_handle
+            owns_handle = hprinter is None
+            if owns_handle:
+                hprinter = win32print.OpenPrinter(self.printer_name)
+            
+            try:
+                win32print.StartDocPrinter(hprinter, 1, (job_name, None, "RAW"))
+                
+                try:
+                    for _ in range(copies):
+                        win32print.StartPagePrinter(hprinter)
+                        win32print.WritePrinter(hprinter, payload)
+                        win32print.EndPagePrinter(hprinter)
+                        written += 1
+                    
+                finally:
+                    win32print.EndDocPrinter(hprinter)
+                    
+            finally:
+                if owns_handle:
+                    win32print.ClosePrinter(hprinter)
+            
+        except Exception as e:
+            logger.error(f"Error sending {job_name}: {e}")
+        
+        return written
+    
+    def send_zpl(self, zpl_commands: Union[str, bytes]) -> bool:
         """
         Send ZPL commands to the printer.
         
         Args:
-            zpl_commands (str): ZPL command string
+            zpl_commands (str | bytes): ZPL command string, or already-encoded bytes
             
         Returns:
             bool: True if successful, False otherwise
@@ -139,16 +316,15 @@ class ZebraZPL:
         
         # Debug mode - simulate printing
         if self.debug_mode:
+            zpl_commands = _to_text(zpl_commands)
             self.last_print_data = zpl_commands
             logger.info("🖨️ DEBUG MODE: Simulating ZPL print job")
-            logger.info(f"📄 ZPL Commands ({len(zpl_commands)} chars):")
-            
-            # Show a preview of the ZPL commands
+            # Show a preview of the ZPL commands as a single log record
             lines = zpl_commands.strip().split('\n')
-            for i, line in enumerate(lines[:10]):  # Show first 10 lines
-                logger.info(f"   {i+1:2d}: {line}")
+            preview = [f"   {i+1:2d}: {line}" for i, line in enumerate(lines[:10])]  # First 10 lines
             if len(lines) > 10:
-                logger.info(f"   ... ({len(lines)-10} more lines)")
+                preview.append(f"   ... ({len(lines)-10} more lines)")
+            logger.info("📄 ZPL Commands (%d chars):\n%s", len(zpl_commands), "\n".join(preview))
             
             logger.info("✅ DEBUG MODE: Print job simulated successfully")
             return True
@@ -157,37 +333,18 @@ class ZebraZPL:
             logger.error("win32print not available")
             return False
         
-        try:
-            hprinter = win32print.OpenPrinter(self.printer_name)
-            
-            try:
-                job_info = ("ZPL Print Job", None, "RAW")
-                job_id = win32print.StartDocPrinter(hprinter, 1, job_info)
-                
-                try:
-                    win32print.StartPagePrinter(hprinter)
-                    win32print.WritePrinter(hprinter, zpl_commands.encode('utf-8'))
-                    win32print.EndPagePrinter(hprinter)
-                    
-                finally:
-                    win32print.EndDocPrinter(hprinter)
-                    
-            finally:
-                win32print.ClosePrinter(hprinter)
-            
-            logger.info("Successfully sent ZPL commands to printer")
-            return True
-            
-        except Exception as e:
-            logger.error(f"Error sending ZPL commands: {e}")
+        if self._write_raw(_to_bytes(zpl_commands), "ZPL Print Job") != 1:
             return False
+        
+        logger.info("Successfully sent ZPL commands to printer")
+        return True
     
-    def send_tspl(self, tspl_commands: str) -> bool:
+    def send_tspl(self, tspl_commands: Union[str, bytes]) -> bool:
         """
         Send TSPL commands to the printer (for XPrinter and TSC printers).
         
         Args:
-            tspl_commands (str): TSPL command string
+            tspl_commands (str | bytes): TSPL command string, or already-encoded bytes
             
         Returns:
             bool: True if successful, False otherwise
@@ -198,16 +355,15 @@ class ZebraZPL:
         
         # Debug mode - simulate printing
         if self.debug_mode:
+            tspl_commands = _to_text(tspl_commands)
             self.last_print_data = tspl_commands
             logger.info("🖨️ DEBUG MODE: Simulating TSPL print job")
-            logger.info(f"📄 TSPL Commands ({len(tspl_commands)} chars):")
-            
-            # Show a preview of the TSPL commands
+            # Show a preview of the TSPL commands as a single log record
             lines = tspl_commands.strip().split('\n')
-            for i, line in enumerate(lines[:15]):  # Show first 15 lines
-                logger.info(f"   {i+1:2d}: {line}")
+            preview = [f"   {i+1:2d}: {line}" for i, line in enumerate(lines[:15])]  # First 15 lines
             if len(lines) > 15:
-                logger.info(f"   ... ({len(lines)-15} more lines)")
+                preview.append(f"   ... ({len(lines)-15} more lines)")
+            logger.info("📄 TSPL Commands (%d chars):\n%s", len(tspl_commands), "\n".join(preview))
             
             logger.info("✅ DEBUG MODE: TSPL print job simulated successfully")
             return True
@@ -216,30 +372,32 @@ class ZebraZPL:
             logger.error("win32print not available")
             return False
         
-        try:
-            hprinter = win32print.OpenPrinter(self.printer_name)
-            
-            try:
-                job_info = ("TSPL Print Job", None, "RAW")
-                job_id = win32print.StartDocPrinter(hprinter, 1, job_info)
-                
-                try:
-                    win32print.StartPagePrinter(hprinter)
-                    win32print.WritePrinter(hprinter, tspl_commands.encode('utf-8'))
-                    win32print.EndPagePrinter(hprinter)
-                    
-                finally:
-                    win32print.EndDocPrinter(hprinter)
-                    
-            finally:
-                win32print.ClosePrinter(hprinter)
-            
-            logger.info("Successfully sent TSPL commands to printer")
-            return True
-            
-        except Exception as e:
-            logger.error(f"Error sending TSPL commands: {e}")
+        if self._write_raw(_to_bytes(tspl_commands), "TSPL Print Job") != 1:
             return False
+        
+        logger.info("Successfully sent TSPL commands to printer")
+        return True
+    
+    def _submit(self, send, commands: Union[str, bytes]) -> Future:
+        """Run send(commands) on the background writer thread."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="zpl-writer")
+        return self._executor.submit(send, commands)
+    
+    def send_zpl_async(self, zpl_commands: Union[str, bytes]) -> Future:
+        """
+        Queue ZPL commands to be sent from a background thread.
+        
+        Jobs are sent one at a time, in submission order, so a GUI callback can
+        hand off a label and return immediately instead of waiting on the spooler.
+        
+        Args:
+            zpl_commands (str): ZPL command string
+            
+        Returns:
+            Future: Resolves to the bool result of send_zpl
+        """
+        return self._submit(self.send_zpl, zpl_commands)
     
     def create_text_label(self, title: str, text_lines: List[str], 
                          title_size: int = 36, text_size: int = 18) -> str:
@@ -255,21 +413,23 @@ class ZebraZPL:
         Returns:
             str: ZPL command string
         """
-        zpl = "^XA\n"  # Start format
-        zpl += "^LH30,30\n"  # Label home position
+        parts = [
+            "^XA",  # Start format
+            "^LH30,30",  # Label home position
+        ]
         
         # Title
         y_pos = 10
-        zpl += f"^FO20,{y_pos}^ADN,{title_size},20^FD{title}^FS\n"
+        parts.append(f"^FO20,{y_pos}^ADN,{title_size},20^FD{title}^FS")
         
         # Text lines
         y_pos += title_size + 10
         for line in text_lines:
-            zpl += f"^FO20,{y_pos}^ADN,{text_size},10^FD{line}^FS\n"
+            parts.append(f"^FO20,{y_pos}^ADN,{text_size},10^FD{line}^FS")
             y_pos += text_size + 5
         
-        zpl += "^XZ\n"  # End format
-        return zpl
+        parts.append("^XZ\n")  # End format
+        return "\n".join(parts)
     
     def create_barcode_label(self, title: str, barcode_data: str, 
                            barcode_type: str = "BCN", text_lines: List[str] = None) -> str:
@@ -285,35 +445,35 @@ class ZebraZPL:
         Returns:
             str: ZPL command string
         """
-        zpl = "^XA\n"
-        zpl += "^LH30,30\n"
+        parts = ["^XA", "^LH30,30"]
         
         # Title
         y_pos = 10
-        zpl += f"^FO20,{y_pos}^ADN,24,12^FD{title}^FS\n"
+        parts.append(f"^FO20,{y_pos}^ADN,24,12^FD{title}^FS")
         y_pos += 40
         
         # Additional text lines
         if text_lines:
             for line in text_lines:
-                zpl += f"^FO20,{y_pos}^ADN,18,10^FD{line}^FS\n"
+                parts.append(f"^FO20,{y_pos}^ADN,18,10^FD{line}^FS")
                 y_pos += 25
         
         # Barcode
         y_pos += 10
-        zpl += f"^FO20,{y_pos}^BY2^{barcode_type},70,Y,N,N^FD{barcode_data}^FS\n"
+        parts.append(f"^FO20,{y_pos}^BY2^{barcode_type},70,Y,N,N^FD{barcode_data}^FS")
         
-        zpl += "^XZ\n"
-        return zpl
+        parts.append("^XZ\n")
+        return "\n".join(parts)
     
-    def create_shipping_label(self, from_info: Dict, to_info: Dict, 
+    def create_shipping_label(self, from_info: Union[ShippingAddress, Dict],
+                            to_info: Union[ShippingAddress, Dict],
                             tracking: str = None, date: str = None) -> str:
         """
         Create a shipping label with from/to addresses.
         
         Args:
-            from_info (Dict): Sender information {'name', 'address1', 'address2', 'city_state_zip'}
-            to_info (Dict): Recipient information {'name', 'address1', 'address2', 'city_state_zip'}
+            from_info (ShippingAddress | Dict): Sender; a dict uses the ShippingAddress field names as keys
+            to_info (ShippingAddress | Dict): Recipient; a dict uses the ShippingAddress field names as keys
             tracking (str): Optional tracking number
             date (str): Optional date string
             
@@ -321,51 +481,33 @@ class ZebraZPL:
             str: ZPL command string
         """
         if not date:
-            date = datetime.datetime.now().strftime("%Y-%m-%d")
+            date = _today_str()
         
-        zpl = "^XA\n"
-        zpl += "^LH30,30\n"
+        from_info = _as_address(from_info)
+        to_info = _as_address(to_info)
+        from_lines = [line for line in from_info[1:] if line]
+        to_lines = [line for line in to_info[1:] if line]
+        
+        parts = ["^XA", "^LH30,30"]
         
         # From section
-        y_pos = 10
-        zpl += f"^FO20,{y_pos}^ADN,20,10^FDFROM:^FS\n"
-        y_pos += 25
-        zpl += f"^FO20,{y_pos}^ADN,16,8^FD{from_info.get('name', '')}^FS\n"
-        y_pos += 20
-        if from_info.get('address1'):
-            zpl += f"^FO20,{y_pos}^ADN,14,7^FD{from_info['address1']}^FS\n"
-            y_pos += 18
-        if from_info.get('address2'):
-            zpl += f"^FO20,{y_pos}^ADN,14,7^FD{from_info['address2']}^FS\n"
-            y_pos += 18
-        if from_info.get('city_state_zip'):
-            zpl += f"^FO20,{y_pos}^ADN,14,7^FD{from_info['city_state_zip']}^FS\n"
+        parts.append("^FO20,10^ADN,20,10^FDFROM:^FS")
+        parts.append(f"^FO20,35^ADN,16,8^FD{from_info.name}^FS")
+        parts.extend(f"{field}{line}^FS" for field, line in zip(self._SHIP_FROM_LINE_FIELDS, from_lines))
         
         # To section
-        y_pos = 160
-        zpl += f"^FO20,{y_pos}^ADN,20,10^FDTO:^FS\n"
-        y_pos += 25
-        zpl += f"^FO20,{y_pos}^ADN,18,9^FD{to_info.get('name', '')}^FS\n"
-        y_pos += 23
-        if to_info.get('address1'):
-            zpl += f"^FO20,{y_pos}^ADN,16,8^FD{to_info['address1']}^FS\n"
-            y_pos += 20
-        if to_info.get('address2'):
-            zpl += f"^FO20,{y_pos}^ADN,16,8^FD{to_info['address2']}^FS\n"
-            y_pos += 20
-        if to_info.get('city_state_zip'):
-            zpl += f"^FO20,{y_pos}^ADN,16,8^FD{to_info['city_state_zip']}^FS\n"
+        parts.append("^FO20,160^ADN,20,10^FDTO:^FS")
+        parts.append(f"^FO20,185^ADN,18,9^FD{to_info.name}^FS")
+        parts.extend(f"{field}{line}^FS" for field, line in zip(self._SHIP_TO_LINE_FIELDS, to_lines))
         
         # Date and tracking
-        y_pos = 320
-        zpl += f"^FO20,{y_pos}^ADN,14,7^FDDate: {date}^FS\n"
+        parts.append(f"^FO20,320^ADN,14,7^FDDate: {date}^FS")
         
         if tracking:
-            y_pos += 25
-            zpl += f"^FO20,{y_pos}^BY2^BCN,50,Y,N,N^FD{tracking}^FS\n"
+            parts.append(f"^FO20,345^BY2^BCN,50,Y,N,N^FD{tracking}^FS")
         
-        zpl += "^XZ\n"
-        return zpl
+        parts.append("^XZ\n")
+        return "\n".join(parts)
     
     def create_product_label(self, product_name: str, sku: str, price: str = None, 
                            barcode: str = None, description: str = None) -> str:
@@ -382,35 +524,64 @@ class ZebraZPL:
         Returns:
             str: ZPL command string
         """
-        zpl = "^XA\n"
-        zpl += "^LH30,30\n"
+        # Layout depends only on which optional fields are present
+        template = self._product_template(bool(price), bool(description))
+        return template(product_name, sku, price, barcode, description)
+    
+    def compile_product_template(self, has_price: bool = True,
+                                 has_desc: bool = False) -> Callable[..., str]:
+        """
+        Precompute a product label layout for a fixed set of optional fields.
         
-        # Product name
-        y_pos = 10
-        zpl += f"^FO20,{y_pos}^ADN,24,12^FD{product_name}^FS\n"
-        y_pos += 35
+        All y positions depend only on whether a price and a description are
+        printed, so they are resolved once here and the returned function only
+        substitutes the field values.
+        
+        Args:
+            has_price (bool): Layout includes the price line
+            has_desc (bool): Layout includes the description line
+            
+        Returns:
+            Callable: render(product_name, sku, price=None, barcode=None, description=None) -> str
+        """
+        parts = ["^XA", "^LH30,30"]
         
-        # SKU
-        zpl += f"^FO20,{y_pos}^ADN,18,9^FDSKU: {sku}^FS\n"
-        y_pos += 25
+        # Product name and SKU
+        parts.append("^FO20,10^ADN,24,12^FD{product_name}^FS")
+        parts.append("^FO20,45^ADN,18,9^FDSKU: {sku}^FS")
+        y_pos = 70
         
         # Price
-        if price:
-            zpl += f"^FO20,{y_pos}^ADN,20,10^FDPrice: {price}^FS\n"
+        if has_price:
+            parts.append(f"^FO20,{y_pos}^ADN,20,10^FDPrice: {{price}}^FS")
             y_pos += 30
         
         # Description
-        if description:
-            zpl += f"^FO20,{y_pos}^ADN,14,7^FD{description}^FS\n"
+        if has_desc:
+            parts.append(f"^FO20,{y_pos}^ADN,14,7^FD{{description}}^FS")
             y_pos += 25
         
         # Barcode (use SKU if no specific barcode provided)
-        barcode_data = barcode or sku
         y_pos += 10
-        zpl += f"^FO20,{y_pos}^BY2^BCN,60,Y,N,N^FD{barcode_data}^FS\n"
+        parts.append(f"^FO20,{y_pos}^BY2^BCN,60,Y,N,N^FD{{barcode}}^FS")
         
-        zpl += "^XZ\n"
-        return zpl
+        parts.append("^XZ\n")
+        template = "\n".join(parts)
+        
+        def render(product_name: str, sku: str, price: str = None,
+                   barcode: str = None, description: str = None) -> str:
+            return template.format(product_name=product_name, sku=sku, price=price,
+                                   barcode=barcode or sku, description=description)
+        
+        return render
+    
+    def _product_template(self, has_price: bool, has_desc: bool) -> Callable[..., str]:
+        """Return the compiled product template for these flags, compiling it on first use."""
+        key = (has_price, has_desc)
+        template = self._product_templates.get(key)
+        if template is None:
+            template = self._product_templates[key] = self.compile_product_template(has_price, has_desc)
+        return template
     
     def print_text_label(self, title: str, text_lines: List[str], copies: int = 1) -> bool:
         """Print a simple text label."""
@@ -423,7 +594,8 @@ class ZebraZPL:
         zpl = self.create_barcode_label(title, barcode_data, text_lines=text_lines)
         return self.print_multiple(zpl, copies)
     
-    def print_shipping_label(self, from_info: Dict, to_info: Dict, 
+    def print_shipping_label(self, from_info: Union[ShippingAddress, Dict],
+                           to_info: Union[ShippingAddress, Dict],
                            tracking: str = None, copies: int = 1) -> bool:
         """Print a shipping label."""
         zpl = self.create_shipping_label(from_info, to_info, tracking)
@@ -435,25 +607,59 @@ class ZebraZPL:
         zpl = self.create_product_label(product_name, sku, price, barcode)
         return self.print_multiple(zpl, copies)
     
-    def print_multiple(self, zpl_commands: str, copies: int = 1) -> bool:
+    def print_multiple(self, zpl_commands: Union[str, bytes], copies: int = 1,
+                       use_firmware_quantity: bool = True) -> bool:
         """
         Print multiple copies of a ZPL label.
         
         Args:
-            zpl_commands (str): ZPL command string
+            zpl_commands (str | bytes): ZPL command string, or already-encoded bytes
             copies (int): Number of copies to print
+            use_firmware_quantity (bool): For a single label format without its own ^PQ,
+                                          send it once with ^PQ so the printer makes the copies
             
         Returns:
             bool: True if successful, False otherwise
         """
+        # Encode once; every path below reuses the same payload
+        payload = _to_bytes(zpl_commands)
+        
+        if not self.debug_mode and not (WIN32_AVAILABLE and self.printer_name):
+            logger.error(f"No printer available to print {copies} copies")
+            return False
+        
+        if use_firmware_quantity and copies > 1:
+            end = len(payload.rstrip()) - 3
+            if payload.startswith(b'^XZ', end) and payload.count(b'^XA') == 1 and b'^PQ' not in payload:
+                logger.info(f"Printing {copies} copies with ^PQ")
+                # Insert ^PQ before the final ^XZ and keep whatever terminator follows it
+                if self.send_zpl(b"%s^PQ%d,0,0,N\n%s" % (payload[:end], copies, payload[end:])):
+                    logger.info(f"Successfully printed {copies} copies")
+                    return True
+                logger.error(f"Failed to print {copies} copies")
+                return False
+        
         success_count = 0
-        for i in range(copies):
-            if copies > 1:
-                logger.info(f"Printing copy {i+1}/{copies}")
-            if self.send_zpl(zpl_commands):
-                success_count += 1
+        
+        if self.debug_mode:
+            # Simulated jobs, one per copy
+            for i in range(copies):
+                if copies > 1:
+                    logger.info(f"Printing copy {i+1}/{copies}")
+                if self.send_zpl(payload):
+                    success_count += 1
+        else:
+            # All copies in one spooler job: a single WritePrinter of the repeated
+            # payload when it is small enough, otherwise one page per copy.
+            # A failed job is reported, not retried: the spooler may already have
+            # accepted some pages, and resending them could print labels twice.
+            # _write_raw stops at the first spooler error, so a failing printer
+            # never gets the rest of the pages.
+            if len(payload) * copies < MAX_COMBINED_PAYLOAD:
+                if self._write_raw(payload * copies, "ZPL Print Job") == 1:
+                    success_count = copies
             else:
-                logger.error(f"Failed to print copy {i+1}")
+                success_count = self._write_raw(payload, "ZPL Print Job", copies)
         
         success = success_count == copies
         if success:
@@ -468,11 +674,16 @@ class ZebraZPL:
         if not self.printer_name or not WIN32_AVAILABLE:
             return {}
         
+        now = time.monotonic()
+        cached_at, cached_name, cached_status = self._status_cache
+        if cached_status and cached_name == self.printer_name and now - cached_at < STATUS_CACHE_TTL:
+            return dict(cached_status)
+        
         try:
             hprinter = win32print.OpenPrinter(self.printer_name)
             try:
                 printer_info = win32print.GetPrinter(hprinter, 2)
-                return {
+                status = {
                     'name': printer_info['pPrinterName'],
                     'status': printer_info['Status'],
                     'driver': printer_info['pDriverName'],
@@ -480,6 +691,8 @@ class ZebraZPL:
                     'location': printer_info.get('pLocation', 'Unknown'),
                     'comment': printer_info.get('pComment', '')
                 }
+                self._status_cache = (now, self.printer_name, status)
+                return dict(status)
             finally:
                 win32print.ClosePrinter(hprinter)
                 
@@ -502,7 +715,7 @@ def main():
     parser.add_argument('--barcode', nargs=2, help='Create barcode label: --barcode "Title" "1234567890"')
     parser.add_argument('--product', nargs='+', help='Create product label: --product "Name" "SKU" ["Price"] ["Barcode"]')
     parser.add_argument('--raw-zpl', help='Send raw ZPL commands from string')
-    parser.add_argument('--zpl-file', help='Send ZPL commands from file')
+    parser.add_argument('--zpl-file', nargs='+', help='Send ZPL commands from one or more files in one printer session')
     
     args = parser.parse_args()
     
@@ -510,20 +723,21 @@ def main():
     printer = ZebraZPL(args.printer)
     
     if args.list_printers:
-        print("Available printers:")
+        lines = ["Available printers:"]
         for p in printer.list_printers():
-            marker = " <- Zebra" if any(x in p.lower() for x in ['zebra', 'gc420', 'zdesigner']) else ""
-            print(f"  - {p}{marker}")
+            marker = " <- Zebra" if _ZEBRA_RE.search(p) else ""
+            lines.append(f"  - {p}{marker}")
+        print("\n".join(lines))
         return
     
     if not printer.printer_name:
-        print("Error: No Zebra printer found. Available printers:")
-        for p in printer.list_printers():
-            print(f"  - {p}")
-        print("\nSpecify printer name with --printer option")
+        lines = ["Error: No Zebra printer found. Available printers:"]
+        lines.extend(f"  - {p}" for p in printer.list_printers())
+        lines.append("\nSpecify printer name with --printer option")
+        print("\n".join(lines))
         return
     
-    print(f"Using printer: {printer.printer_name}")
+    print("Using printer:", printer.printer_name)
     
     # Handle different label types
     success = False
@@ -554,13 +768,20 @@ def main():
         success = printer.print_multiple(args.raw_zpl, args.copies)
     
     elif args.zpl_file:
-        try:
-            with open(args.zpl_file, 'r') as f:
-                zpl_content = f.read()
-            success = printer.print_multiple(zpl_content, args.copies)
-        except FileNotFoundError:
-            print(f"Error: ZPL file not found: {args.zpl_file}")
-            return
+        # Read every file first so a missing one fails before anything is printed
+        zpl_jobs = []
+        for zpl_file in args.zpl_file:
+            try:
+                with open(zpl_file, 'rb') as f:
+                    zpl_jobs.append(f.read())
+            except FileNotFoundError:
+                print("Error: ZPL file not found:", zpl_file)
+                return
+        
+        # One printer handle for the whole batch
+        with printer:
+            results = [printer.print_multiple(zpl, args.copies) for zpl in zpl_jobs]
+        success = all(results)
     
     else:
         print("Error: No label type specified. Use --text, --barcode, --product, --raw-zpl, or --zpl-file")
@@ -568,9 +789,9 @@ def main():
         return
     
     if success:
-        print("✅ Print job completed successfully!")
+        print("Print job completed successfully!")
     else:
-        print("❌ Print job failed!")
+        print("Print job failed!")
 
 
 if __name__ == "__main__":